@@ -22,8 +22,9 @@ Puedes extender este módulo sin romper nada si agregas nuevos nodos.
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 
 # ==========================================================
@@ -32,24 +33,26 @@ from typing import Any, List, Optional, Union
 
 class Node:
     """Nodo base de todo el AST."""
-    pass
+    # Sin __dict__ en la base: así los nodos con slots=True no cargan
+    # un diccionario por instancia.
+    __slots__ = ()
 
 
 class Stmt(Node):
     """Nodo base para todas las sentencias."""
-    pass
+    __slots__ = ()
 
 
 class Expr(Node):
     """Nodo base para todas las expresiones."""
-    pass
+    __slots__ = ()
 
 
 # ==========================================================
 #  PROGRAMA / MÓDULO
 # ==========================================================
 
-@dataclass
+@dataclass(slots=True)
 class Program(Node):
     """
     Representa el archivo completo:
@@ -63,7 +66,7 @@ class Program(Node):
 #  EXPRESIONES BÁSICAS
 # ==========================================================
 
-@dataclass
+@dataclass(slots=True)
 class Name(Expr):
     """
     Identificador, por ejemplo: a, total, _x
@@ -71,7 +74,7 @@ class Name(Expr):
     id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Num(Expr):
     """
     Constante numérica (int o float).
@@ -79,7 +82,7 @@ class Num(Expr):
     value: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Str(Expr):
     """
     Constante de cadena, por ejemplo: "hola".
@@ -87,18 +90,20 @@ class Str(Expr):
     value: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Bool(Expr):
     """
     Constante booleana: True o False.
+    Inmutable: el parser comparte una sola instancia por valor.
     """
     value: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NoneLiteral(Expr):
     """
     Constante None.
+    Inmutable: el parser comparte una sola instancia.
     """
     pass
 
@@ -107,7 +112,7 @@ class NoneLiteral(Expr):
 #  EXPRESIONES COMPUESTAS
 # ==========================================================
 
-@dataclass
+@dataclass(slots=True)
 class BinOp(Expr):
     """
     Operación binaria aritmética / bit a bit:
@@ -122,7 +127,7 @@ class BinOp(Expr):
     right: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOp(Expr):
     """
     Operador unario:
@@ -135,7 +140,7 @@ class UnaryOp(Expr):
     operand: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class BoolOp(Expr):
     """
     Operaciones lógicas encadenadas:
@@ -149,7 +154,7 @@ class BoolOp(Expr):
     values: List[Expr]
 
 
-@dataclass
+@dataclass(slots=True)
 class Compare(Expr):
     """
     Comparaciones encadenadas:
@@ -167,7 +172,7 @@ class Compare(Expr):
     comparators: List[Expr]
 
 
-@dataclass
+@dataclass(slots=True)
 class Call(Expr):
     """
     Llamada a función:
@@ -176,13 +181,14 @@ class Call(Expr):
 
     args: lista de argumentos posicionales
     keywords: pares (nombre, valor) para kwargs
+    (el parser usa la tupla vacía () cuando no hay ninguno)
     """
     func: Expr
-    args: List[Expr] = field(default_factory=list)
-    keywords: List["KeywordArg"] = field(default_factory=list)
+    args: Sequence[Expr] = ()
+    keywords: Sequence["KeywordArg"] = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class KeywordArg(Node):
     """
     Argumento con nombre en una llamada:
@@ -193,7 +199,7 @@ class KeywordArg(Node):
     value: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Attribute(Expr):
     """
     Acceso a atributo:
@@ -204,7 +210,7 @@ class Attribute(Expr):
     attr: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Subscript(Expr):
     """
     Acceso por índice o slice:
@@ -215,7 +221,7 @@ class Subscript(Expr):
     slice: "Slice"
 
 
-@dataclass
+@dataclass(slots=True)
 class Slice(Node):
     """
     Slice simple o extendido:
@@ -231,7 +237,7 @@ class Slice(Node):
 #  SENTENCIAS
 # ==========================================================
 
-@dataclass
+@dataclass(slots=True)
 class ExprStmt(Stmt):
     """
     Sentencia de expresión:
@@ -241,7 +247,7 @@ class ExprStmt(Stmt):
     value: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Assign(Stmt):
     """
     Asignación simple:
@@ -255,7 +261,7 @@ class Assign(Stmt):
     value: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class AugAssign(Stmt):
     """
     Asignación aumentada:
@@ -269,7 +275,7 @@ class AugAssign(Stmt):
     value: Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Return(Stmt):
     """
     Sentencia return:
@@ -279,25 +285,25 @@ class Return(Stmt):
     value: Optional[Expr] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Pass(Stmt):
     """Sentencia 'pass'."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Break(Stmt):
     """Sentencia 'break'."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Continue(Stmt):
     """Sentencia 'continue'."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class If(Stmt):
     """
     Sentencia if / elif / else:
@@ -312,13 +318,15 @@ class If(Stmt):
     Se modela como:
         test, body, orelse (lista de Stmt)
     Donde orelse puede contener otro If (elif) o un bloque simple (else).
+    Sin elif/else, orelse es la tupla vacía compartida () (igual en While
+    y For): quien lo recorra solo debe iterarlo.
     """
     test: Expr
     body: List[Stmt] = field(default_factory=list)
-    orelse: List[Stmt] = field(default_factory=list)
+    orelse: Sequence[Stmt] = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class While(Stmt):
     """
     Sentencia while:
@@ -330,10 +338,10 @@ class While(Stmt):
     """
     test: Expr
     body: List[Stmt] = field(default_factory=list)
-    orelse: List[Stmt] = field(default_factory=list)
+    orelse: Sequence[Stmt] = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class For(Stmt):
     """
     Sentencia for:
@@ -346,14 +354,14 @@ class For(Stmt):
     target: Expr
     iter: Expr
     body: List[Stmt] = field(default_factory=list)
-    orelse: List[Stmt] = field(default_factory=list)
+    orelse: Sequence[Stmt] = ()
 
 
 # ==========================================================
 #  FUNCIONES
 # ==========================================================
 
-@dataclass
+@dataclass(slots=True)
 class Arg(Node):
     """
     Parámetro de función:
@@ -368,16 +376,7 @@ class Arg(Node):
     default: Optional[Expr] = None
 
 
-@dataclass
-class Arguments(Node):
-    """
-    Conjunto de parámetros de función (muy simplificado respecto a Python real).
-    Considera solo posicionales con default opcional.
-    """
-    args: List[Arg] = field(default_factory=list)
-
-
-@dataclass
+@dataclass(slots=True)
 class FunctionDef(Stmt):
     """
     Definición de función:
@@ -386,11 +385,13 @@ class FunctionDef(Stmt):
             body
 
     Para simplificar:
+        - args: lista de parámetros (solo posicionales con default opcional,
+          muy simplificado respecto a Python real)
         - no se manejan decoradores aquí (se pueden agregar luego)
         - returns: anotación de tipo de retorno opcional
     """
     name: str
-    args: Arguments
+    args: List[Arg] = field(default_factory=list)
     body: List[Stmt] = field(default_factory=list)
     returns: Optional[Expr] = None
     decorators: List[Expr] = field(default_factory=list)
@@ -405,27 +406,44 @@ def pretty_print(node: Node, indent: int = 0) -> None:
     Imprime el AST de forma legible para depuración.
     No es obligatorio usarlo en el compilador, pero ayuda muchísimo
     para entender que está generando el parser.
+
+    Todo el texto se arma primero en una lista y se escribe de una sola vez,
+    en lugar de hacer un print() por línea.
     """
-    prefix = "  " * indent
-    if isinstance(node, list):
-        print(prefix + "[")
+    out: List[str] = []
+    _format_node(node, indent, out)
+    sys.stdout.write("".join(out))
+
+
+# Cache de prefijos de indentación ("  " * nivel)
+_INDENTS: Dict[int, str] = {}
+
+# Secuencias de nodos que se imprimen como lista
+_LIST_TYPES = (list, tuple)
+
+
+def _format_node(node: Node, indent: int, out: List[str]) -> None:
+    prefix = _INDENTS.get(indent)
+    if prefix is None:
+        prefix = _INDENTS[indent] = "  " * indent
+
+    if type(node) in _LIST_TYPES:
+        out.append(prefix + "[\n")
         for item in node:
-            pretty_print(item, indent + 1)
-        print(prefix + "]")
+            _format_node(item, indent + 1, out)
+        out.append(prefix + "]\n")
         return
 
     if not isinstance(node, Node):
-        print(prefix + repr(node))
+        out.append(prefix + repr(node) + "\n")
         return
 
-    cls_name = node.__class__.__name__
-    print(f"{prefix}{cls_name}(")
+    out.append(prefix + node.__class__.__name__ + "(\n")
     for field_name in getattr(node, "__dataclass_fields__", {}):
         value = getattr(node, field_name)
-        print(f"{prefix}  {field_name} = ", end="")
-        if isinstance(value, Node) or isinstance(value, list):
-            print()
-            pretty_print(value, indent + 2)
+        if type(value) in _LIST_TYPES or isinstance(value, Node):
+            out.append(prefix + "  " + field_name + " = \n")
+            _format_node(value, indent + 2, out)
         else:
-            print(repr(value))
-    print(f"{prefix})")
+            out.append(prefix + "  " + field_name + " = " + repr(value) + "\n")
+    out.append(prefix + ")\n")
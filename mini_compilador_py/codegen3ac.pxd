@@ -0,0 +1,17 @@
+# codegen3ac.pxd: declaraciones Cython para codegen3ac.py (ver setup.py)
+
+cdef class CodeGenerator3AC:
+    cdef public object program
+    cdef public object emit_raw
+    cdef public object emit_many
+    cdef int temp_count
+    cdef int label_count
+    cdef list _temp_cache
+    cdef dict _literal_cache
+    cdef public list break_stack
+    cdef public list continue_stack
+    cdef dict _stmt_dispatch
+    cdef dict _expr_dispatch
+
+    cpdef str new_temp(self)
+    cpdef str new_label(self, str prefix=*)
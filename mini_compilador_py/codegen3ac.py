@@ -25,8 +25,13 @@ con el parser que ya construimos.
 
 from __future__ import annotations
 
+import os
+import sys
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional
+from enum import IntEnum
+from itertools import repeat
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
 
 from astnodes import (
     Program,
@@ -42,7 +47,6 @@ from astnodes import (
     While,
     For,
     FunctionDef,
-    Arguments,
     Arg,
     Name,
     Num,
@@ -61,24 +65,119 @@ from astnodes import (
 )
 
 
+# Con TAC_DEBUG=1 en el entorno se conservan los comentarios de las
+# instrucciones ("# for index", "# implicit return", ...). Sin él, el
+# programa 3AC no guarda esa columna.
+DEBUG_3AC = os.environ.get("TAC_DEBUG") == "1"
+
+
+# ==========================================================
+#  Códigos de operación 3AC
+# ==========================================================
+
+class Op(IntEnum):
+    """
+    Operaciones 3AC como enteros pequeños: comparar o despachar sobre un
+    Op es una comparación de enteros, no de cadenas.
+
+    Los operadores del AST ('+', '<', 'not', ...) se traducen con
+    OP_FROM_STR; OP_NAMES da el texto de cada operación al imprimir.
+    """
+    # Instrucciones con formato propio
+    ASSIGN = 0
+    GOTO = 1
+    IF_FALSE_GOTO = 2
+    RETURN = 3
+    PARAM = 4
+    CALL = 5
+    LABEL = 6
+    FUNC_BEGIN = 7
+    FUNC_END = 8
+    # Aritméticas / bit a bit (también se usan como unarias: +x, -x, ~x)
+    ADD = 9
+    SUB = 10
+    MUL = 11
+    DIV = 12
+    FLOORDIV = 13
+    MOD = 14
+    POW = 15
+    MATMUL = 16
+    LSHIFT = 17
+    RSHIFT = 18
+    BITAND = 19
+    BITOR = 20
+    BITXOR = 21
+    INVERT = 22
+    # Lógicas
+    NOT = 23
+    AND = 24
+    OR = 25
+    # Comparaciones
+    EQ = 26
+    NE = 27
+    LT = 28
+    LE = 29
+    GT = 30
+    GE = 31
+    # Operaciones abstractas
+    LEN = 32
+    LOAD_INDEX = 33
+    GETATTR = 34
+    SLICE = 35
+
+
+# Texto de cada operación, indexado por Op
+OP_NAMES: List[str] = [
+    "=", "goto", "if_false_goto", "return", "param", "call", "label",
+    "func_begin", "func_end",
+    "+", "-", "*", "/", "//", "%", "**", "@", "<<", ">>", "&", "|", "^", "~",
+    "not", "and", "or",
+    "==", "!=", "<", "<=", ">", ">=",
+    "len", "load_index", "getattr", "slice",
+]
+
+# Operador en texto (como aparece en el AST) -> Op
+OP_FROM_STR: Dict[str, Op] = {name: Op(i) for i, name in enumerate(OP_NAMES)}
+
+# Código numérico -> miembro de Op (la columna ops de TACProgram guarda bytes)
+OP_BY_CODE: Tuple[Op, ...] = tuple(Op)
+
+# Asignación aumentada -> operación base ('+=' -> Op.ADD, ...)
+_AUG_BASE: Dict[str, Op] = {
+    "+=": Op.ADD,
+    "-=": Op.SUB,
+    "*=": Op.MUL,
+    "/=": Op.DIV,
+    "//=": Op.FLOORDIV,
+    "%=": Op.MOD,
+    "**=": Op.POW,
+    "@=": Op.MATMUL,
+    "&=": Op.BITAND,
+    "|=": Op.BITOR,
+    "^=": Op.BITXOR,
+    "<<=": Op.LSHIFT,
+    ">>=": Op.RSHIFT,
+}
+
+
 # ==========================================================
 #  Representación de instrucción 3AC
 # ==========================================================
 
-@dataclass
+@dataclass(slots=True)
 class TACInstr:
     """
     Instrucción de código en tres direcciones.
 
     Campos:
-        op      : operación (string), ej. '+', '-', 'if_false_goto', 'call', 'label'
+        op      : operación (Op), ej. Op.ADD, Op.IF_FALSE_GOTO, Op.CALL, Op.LABEL
         arg1    : primer operando (string o None)
         arg2    : segundo operando (string o None)
         result  : destino (string o None)
         label   : nombre de etiqueta si aplica (para op='label' o saltos)
         comment : comentario opcional
     """
-    op: str
+    op: Op
     arg1: Optional[str] = None
     arg2: Optional[str] = None
     result: Optional[str] = None
@@ -86,59 +185,280 @@ class TACInstr:
     comment: Optional[str] = None
 
     def __str__(self) -> str:
-        parts = []
-
-        # Etiqueta (L1:) al inicio si existe
-        if self.label:
-            parts.append(f"{self.label}:")
-
-        # Instrucciones "especiales"
-        if self.op == "label":
-            # solo la etiqueta
-            pass
-        elif self.op == "goto":
-            parts.append(f"goto {self.result}")
-        elif self.op == "if_false_goto":
-            parts.append(f"if_false {self.arg1} goto {self.result}")
-        elif self.op == "return":
-            if self.arg1 is not None:
-                parts.append(f"return {self.arg1}")
-            else:
-                parts.append("return")
-        elif self.op == "param":
-            parts.append(f"param {self.arg1}")
-        elif self.op == "call":
-            # call func, n_args, result
-            if self.result:
-                parts.append(f"{self.result} = call {self.arg1}, {self.arg2}")
-            else:
-                parts.append(f"call {self.arg1}, {self.arg2}")
-        elif self.op == "func_begin":
-            parts.append(f"func_begin {self.result}")
-        elif self.op == "func_end":
-            parts.append(f"func_end {self.result}")
-        else:
-            # Forma general result = arg1 op arg2
-            if self.result is not None:
-                if self.arg2 is not None:
-                    parts.append(f"{self.result} = {self.arg1} {self.op} {self.arg2}")
-                elif self.arg1 is not None:
-                    parts.append(f"{self.result} = {self.op}{self.arg1}")
-                else:
-                    parts.append(f"{self.result} = {self.op}")
-            else:
-                # op sin result explícito, muy raro pero lo soportamos
-                if self.arg1 is not None and self.arg2 is not None:
-                    parts.append(f"{self.arg1} {self.op} {self.arg2}")
-                elif self.arg1 is not None:
-                    parts.append(f"{self.op} {self.arg1}")
-                else:
-                    parts.append(self.op)
+        return format_instr(
+            self.op, self.arg1, self.arg2, self.result, self.label, self.comment
+        )
+
+
+def _fmt_assign(op: Op, arg1, arg2, result) -> str:
+    return f"{result} = {arg1}"
+
+
+def _fmt_goto(op: Op, arg1, arg2, result) -> str:
+    return f"goto {result}"
+
+
+def _fmt_if_false_goto(op: Op, arg1, arg2, result) -> str:
+    return f"if_false {arg1} goto {result}"
+
+
+def _fmt_return(op: Op, arg1, arg2, result) -> str:
+    if arg1 is not None:
+        return f"return {arg1}"
+    return "return"
+
+
+def _fmt_param(op: Op, arg1, arg2, result) -> str:
+    return f"param {arg1}"
+
+
+def _fmt_call(op: Op, arg1, arg2, result) -> str:
+    # call func, n_args, result
+    if result:
+        return f"{result} = call {arg1}, {arg2}"
+    return f"call {arg1}, {arg2}"
+
+
+def _fmt_label(op: Op, arg1, arg2, result) -> str:
+    # solo la etiqueta (la agrega format_instr)
+    return ""
+
+
+def _fmt_func_begin(op: Op, arg1, arg2, result) -> str:
+    return f"func_begin {result}"
+
+
+def _fmt_func_end(op: Op, arg1, arg2, result) -> str:
+    return f"func_end {result}"
+
+
+def _fmt_generic(op: Op, arg1, arg2, result) -> str:
+    # Forma general result = arg1 op arg2
+    name = OP_NAMES[op]
+    if result is not None:
+        if arg2 is not None:
+            return f"{result} = {arg1} {name} {arg2}"
+        if arg1 is not None:
+            return f"{result} = {name}{arg1}"
+        return f"{result} = {name}"
+    # op sin result explícito, muy raro pero lo soportamos
+    if arg1 is not None and arg2 is not None:
+        return f"{arg1} {name} {arg2}"
+    if arg1 is not None:
+        return f"{name} {arg1}"
+    return name
+
+
+# Formateador de cada operación, indexado por Op
+_FORMATTERS: List[Callable[..., str]] = [_fmt_generic] * len(Op)
+_FORMATTERS[Op.ASSIGN] = _fmt_assign
+_FORMATTERS[Op.GOTO] = _fmt_goto
+_FORMATTERS[Op.IF_FALSE_GOTO] = _fmt_if_false_goto
+_FORMATTERS[Op.RETURN] = _fmt_return
+_FORMATTERS[Op.PARAM] = _fmt_param
+_FORMATTERS[Op.CALL] = _fmt_call
+_FORMATTERS[Op.LABEL] = _fmt_label
+_FORMATTERS[Op.FUNC_BEGIN] = _fmt_func_begin
+_FORMATTERS[Op.FUNC_END] = _fmt_func_end
+
+
+def format_instr(
+    op: Op,
+    arg1: Optional[str] = None,
+    arg2: Optional[str] = None,
+    result: Optional[str] = None,
+    label: Optional[str] = None,
+    comment: Optional[str] = None,
+) -> str:
+    """
+    Representación textual de una instrucción 3AC a partir de sus campos.
+    La comparten TACInstr y TACProgram.
+    """
+    # Como mucho hay tres piezas (etiqueta, instrucción, comentario):
+    # las unimos directamente en vez de armar una lista y hacer join.
+    text = _FORMATTERS[op](op, arg1, arg2, result)
+
+    # Etiqueta (L1:) al inicio si existe
+    if label:
+        text = f"{label}: {text}" if text else f"{label}:"
+
+    if comment:
+        text = f"{text}     # {comment}" if text else f"    # {comment}"
+
+    return text
+
+
+class TACProgram:
+    """
+    Secuencia de instrucciones 3AC guardada por columnas (structure of arrays):
+    columnas paralelas ops, arg1, arg2, result, label y comment, donde la
+    posición i de cada una describe la instrucción i.
+
+    `ops` es un array('B'): un byte por instrucción con el código de Op
+    (caben hasta 256 operaciones), en lugar de una referencia a objeto.
+    El resto de columnas son listas de str/None.
+
+    Emitir es solo añadir a cada columna (no se crea un objeto por
+    instrucción), y las pasadas que solo miran la operación recorren un
+    buffer contiguo de bytes:
+
+        for i, op in enumerate(prog.ops):
+            if op == Op.GOTO:
+                ...
+
+    La columna `comment` solo existe en modo depuración (DEBUG_3AC); si no,
+    vale None y los comentarios pasados a emit se descartan.
+
+    Indexar o iterar devuelve TACInstr construidas bajo demanda.
+    """
+
+    __slots__ = ("ops", "arg1", "arg2", "result", "label", "comment")
+
+    def __init__(self):
+        self.ops: array = array("B")
+        self.arg1: List[Optional[str]] = []
+        self.arg2: List[Optional[str]] = []
+        self.result: List[Optional[str]] = []
+        self.label: List[Optional[str]] = []
+        self.comment: Optional[List[Optional[str]]] = [] if DEBUG_3AC else None
+
+    # La variante de emit se elige una sola vez, al definir la clase
+    if DEBUG_3AC:
+        def emit(
+            self,
+            op: Op,
+            arg1: Optional[str] = None,
+            arg2: Optional[str] = None,
+            result: Optional[str] = None,
+            label: Optional[str] = None,
+            comment: Optional[str] = None,
+        ) -> None:
+            self.ops.append(op)
+            self.arg1.append(arg1)
+            self.arg2.append(arg2)
+            self.result.append(result)
+            self.label.append(label)
+            self.comment.append(comment)
+    else:
+        def emit(
+            self,
+            op: Op,
+            arg1: Optional[str] = None,
+            arg2: Optional[str] = None,
+            result: Optional[str] = None,
+            label: Optional[str] = None,
+            comment: Optional[str] = None,
+        ) -> None:
+            self.ops.append(op)
+            self.arg1.append(arg1)
+            self.arg2.append(arg2)
+            self.result.append(result)
+            self.label.append(label)
+
+    def emit_many(self, rows: Sequence[Tuple]) -> None:
+        """
+        Emite varias instrucciones de una vez. Cada fila es una tupla
+        (op, arg1, arg2, result, label, comment); cada columna crece con
+        un único extend en lugar de un append por instrucción.
+        """
+        if not rows:
+            return
+        ops, arg1, arg2, result, label, comment = zip(*rows)
+        self.ops.extend(ops)
+        self.arg1.extend(arg1)
+        self.arg2.extend(arg2)
+        self.result.extend(result)
+        self.label.extend(label)
+        if self.comment is not None:
+            self.comment.extend(comment)
+
+    def _rows(self):
+        comments = self.comment
+        if comments is None:
+            comments = repeat(None, len(self.ops))
+        return zip(self.ops, self.arg1, self.arg2, self.result, self.label, comments)
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __getitem__(self, index: int) -> TACInstr:
+        comment = self.comment[index] if self.comment is not None else None
+        return TACInstr(
+            OP_BY_CODE[self.ops[index]], self.arg1[index], self.arg2[index],
+            self.result[index], self.label[index], comment,
+        )
+
+    def __iter__(self) -> Iterator[TACInstr]:
+        for op, arg1, arg2, result, label, comment in self._rows():
+            yield TACInstr(OP_BY_CODE[op], arg1, arg2, result, label, comment)
+
+    def __str__(self) -> str:
+        return "\n".join(format_instr(*row) for row in self._rows())
+
+
+# ==========================================================
+#  Caché de literales
+# ==========================================================
+
+# Caché: (clase del nodo, tipo del valor, valor) -> place ya formateado e
+# internado. El tipo va en la clave porque 1 == 1.0 pero repr(1) != repr(1.0).
+# Cada CodeGenerator3AC tiene la suya, así no crece sin límite entre programas.
+LiteralCache = Dict[Tuple[type, type, Hashable], str]
+
+
+def _literal_place(cache: LiteralCache, node_type: type, value) -> str:
+    """
+    Devuelve el place de una constante (repr del valor), reutilizando el
+    mismo string para literales repetidos (0, 1, "", ...).
+    """
+    key = (node_type, type(value), value)
+    try:
+        place = cache.get(key)
+    except TypeError:
+        # valor no hashable (no debería ocurrir con Num/Str reales)
+        return repr(value)
+    if place is None:
+        place = cache[key] = sys.intern(repr(value))
+    return place
+
+
+# Operadores asociativos cuyas cadenas a op b op c ... se pliegan en un
+# único acumulador temporal
+_FOLDABLE_OPS = frozenset({"+", "*", "&", "|", "^"})
+
+
+class _BinChain:
+    """
+    Cadena izquierda de BinOp con el mismo operador, aplanada:
+
+        ((a + b) + c) + d  ->  _BinChain("+", [a, b, c, d])
+
+    Solo existe dentro de visit_expr; se evalúa igual que un BoolOp.
+    """
+    __slots__ = ("op", "values")
 
-        if self.comment:
-            parts.append(f"    # {self.comment}")
+    def __init__(self, op: str, values: List[Expr]):
+        self.op = op
+        self.values = values
 
-        return " ".join(parts)
+
+def _simple_index(node: Subscript, cache: LiteralCache) -> Optional[Tuple[str, str]]:
+    """
+    Reconoce el subíndice más común, nombre[nombre] o nombre[número], y
+    devuelve directamente los places (base, índice). Para cualquier otra
+    forma devuelve None y se usa el camino general.
+    """
+    value = node.value
+    s = node.slice
+    if type(value) is not Name or s.stop is not None or s.step is not None:
+        return None
+    start = s.start
+    t = type(start)
+    if t is Name:
+        return value.id, start.id
+    if t is Num:
+        return value.id, _literal_place(cache, Num, start.value)
+    return None
 
 
 # ==========================================================
@@ -147,7 +467,7 @@ class TACInstr:
 
 class CodeGenerator3AC:
     """
-    Recorre el AST y genera instrucciones TACInstr.
+    Recorre el AST y genera un TACProgram (instrucciones 3AC por columnas).
 
     Uso:
         from lexer import Lexer
@@ -165,49 +485,95 @@ class CodeGenerator3AC:
     """
 
     def __init__(self):
-        self.code: List[TACInstr] = []
+        self.program = TACProgram()
+        # Emisión posicional directa sobre el programa (op, arg1, arg2,
+        # result, label, comment): sin kwargs ni una llamada intermedia.
+        self.emit_raw = self.program.emit
+        self.emit_many = self.program.emit_many
         self.temp_count = 0
         self.label_count = 0
 
+        # Nombres de temporales ya generados (internados), por índice
+        self._temp_cache: List[str] = []
+        # Places de literales de este programa (ver _literal_place)
+        self._literal_cache: LiteralCache = {}
+
         # Pilas para manejo de break/continue en bucles
         self.break_stack: List[str] = []
         self.continue_stack: List[str] = []
 
+        # Tablas de despacho: clase concreta del nodo -> visitador.
+        # Todos los nodos del AST son clases hoja, así que basta con
+        # buscar type(node) en un dict en vez de encadenar isinstance.
+        # (BinOp, UnaryOp, BoolOp, Compare y Call los resuelve visit_expr
+        # directamente en su recorrido iterativo.)
+        self._stmt_dispatch: Dict[type, Callable[[Stmt], None]] = {
+            ExprStmt: self.visit_exprstmt,
+            Assign: self.visit_assign,
+            AugAssign: self.visit_augassign,
+            Return: self.visit_return,
+            Pass: lambda node: None,  # no genera código
+            Break: self.visit_break,
+            Continue: self.visit_continue,
+            If: self.visit_if,
+            While: self.visit_while,
+            For: self.visit_for,
+            FunctionDef: self.visit_functiondef,
+        }
+        self._expr_dispatch: Dict[type, Callable[[Expr], str]] = {
+            Name: self.visit_name,
+            Num: self.visit_num,
+            Str: self.visit_str,
+            Bool: self.visit_bool,
+            NoneLiteral: self.visit_none,
+            Attribute: self.visit_attribute,
+            Subscript: self.visit_subscript,
+        }
+
     # -------------------------
     #  Utilidades
     # -------------------------
 
     def new_temp(self) -> str:
         self.temp_count += 1
-        return f"t{self.temp_count}"
+        n = self.temp_count
+        cache = self._temp_cache
+        if n >= len(cache):
+            # Crecemos por bloques; cada nombre queda internado y se reutiliza
+            cache.extend(sys.intern(f"t{i}") for i in range(len(cache), n + 64))
+        return cache[n]
 
     def new_label(self, prefix: str = "L") -> str:
         self.label_count += 1
-        return f"{prefix}{self.label_count}"
+        # label_count es único para todas las etiquetas: cada nombre sale
+        # una sola vez, así que se arma bajo demanda (sin caché por prefijo)
+        return sys.intern(f"{prefix}{self.label_count}")
 
     def emit(
         self,
-        op: str,
+        op: Op,
         arg1: Optional[str] = None,
         arg2: Optional[str] = None,
         result: Optional[str] = None,
         label: Optional[str] = None,
         comment: Optional[str] = None,
-    ) -> TACInstr:
-        instr = TACInstr(op=op, arg1=arg1, arg2=arg2, result=result, label=label, comment=comment)
-        self.code.append(instr)
-        return instr
+    ) -> None:
+        """
+        Emite una instrucción con argumentos por nombre (para uso externo).
+        Los visitadores usan emit_raw con los seis argumentos posicionales.
+        """
+        self.program.emit(op, arg1, arg2, result, label, comment)
 
     def emit_label(self, label: str) -> None:
-        self.emit("label", label=label)
+        self.emit_raw(Op.LABEL, None, None, None, label, None)
 
     # -------------------------
     #  Entrada principal
     # -------------------------
 
-    def generate(self, program: Program) -> List[TACInstr]:
+    def generate(self, program: Program) -> TACProgram:
         self.visit_program(program)
-        return self.code
+        return self.program
 
     # ==========================================================
     #  Visitadores de nodos
@@ -215,36 +581,24 @@ class CodeGenerator3AC:
 
     # ------ Programa ------
     def visit_program(self, node: Program) -> None:
-        for stmt in node.body:
-            self.visit_stmt(stmt)
+        self.visit_body(node.body)
+
+    def visit_body(self, body: List[Stmt]) -> None:
+        """
+        Visita una lista de sentencias con el despacho en una variable local
+        (evita buscar self._stmt_dispatch en cada iteración).
+        """
+        dispatch = self._stmt_dispatch
+        fallback = self.visit_stmt  # solo para reportar nodos no soportados
+        for stmt in body:
+            dispatch.get(type(stmt), fallback)(stmt)
 
     # ------ Sentencias ------
     def visit_stmt(self, node: Stmt) -> None:
-        if isinstance(node, ExprStmt):
-            self.visit_exprstmt(node)
-        elif isinstance(node, Assign):
-            self.visit_assign(node)
-        elif isinstance(node, AugAssign):
-            self.visit_augassign(node)
-        elif isinstance(node, Return):
-            self.visit_return(node)
-        elif isinstance(node, Pass):
-            # no genera código
-            pass
-        elif isinstance(node, Break):
-            self.visit_break(node)
-        elif isinstance(node, Continue):
-            self.visit_continue(node)
-        elif isinstance(node, If):
-            self.visit_if(node)
-        elif isinstance(node, While):
-            self.visit_while(node)
-        elif isinstance(node, For):
-            self.visit_for(node)
-        elif isinstance(node, FunctionDef):
-            self.visit_functiondef(node)
-        else:
+        fn = self._stmt_dispatch.get(type(node))
+        if fn is None:
             raise NotImplementedError(f"Sentencia no soportada en 3AC: {type(node).__name__}")
+        fn(node)
 
     def visit_exprstmt(self, node: ExprStmt) -> None:
         # evaluamos la expresión y descartamos el resultado (a menos que sea útil por efectos)
@@ -262,7 +616,7 @@ class CodeGenerator3AC:
         target = node.targets[0]
         target_place = self.get_lvalue_place(target)
         # Asignación simple en 3AC: target = value
-        self.emit("=", arg1=value_place, result=target_place)
+        self.emit_raw(Op.ASSIGN, value_place, None, target_place, None, None)
 
     def visit_augassign(self, node: AugAssign) -> None:
         """
@@ -275,62 +629,78 @@ class CodeGenerator3AC:
         target_place = self.get_lvalue_place(node.target)
         right_place = self.visit_expr(node.value)
 
-        # Convertimos '+=', '-=' etc a '+', '-' etc.
-        op_base = node.op.replace("=", "")  # "+=", "-=", "*=", etc -> "+", "-", "*"
+        # "+=", "-=", "*=", etc -> Op.ADD, Op.SUB, Op.MUL
+        op_base = _AUG_BASE[node.op]
         t = self.new_temp()
-        self.emit(op_base, arg1=target_place, arg2=right_place, result=t)
-        self.emit("=", arg1=t, result=target_place)
+        self.emit_raw(op_base, target_place, right_place, t, None, None)
+        self.emit_raw(Op.ASSIGN, t, None, target_place, None, None)
 
     def visit_return(self, node: Return) -> None:
         if node.value is not None:
             value_place = self.visit_expr(node.value)
-            self.emit("return", arg1=value_place)
+            self.emit_raw(Op.RETURN, value_place, None, None, None, None)
         else:
-            self.emit("return")
+            self.emit_raw(Op.RETURN, None, None, None, None, None)
 
     def visit_break(self, node: Break) -> None:
-        if not self.break_stack:
+        bs = self.break_stack
+        if not bs:
             # break fuera de un bucle, generamos algo por defecto
-            self.emit("goto", result="__INVALID_BREAK__")
+            self.emit_raw(Op.GOTO, None, None, "__INVALID_BREAK__", None, None)
             return
-        end_label = self.break_stack[-1]
-        self.emit("goto", result=end_label)
+        self.emit_raw(Op.GOTO, None, None, bs[-1], None, None)
 
     def visit_continue(self, node: Continue) -> None:
-        if not self.continue_stack:
-            self.emit("goto", result="__INVALID_CONTINUE__")
+        cs = self.continue_stack
+        if not cs:
+            self.emit_raw(Op.GOTO, None, None, "__INVALID_CONTINUE__", None, None)
             return
-        cont_label = self.continue_stack[-1]
-        self.emit("goto", result=cont_label)
+        self.emit_raw(Op.GOTO, None, None, cs[-1], None, None)
 
     def visit_if(self, node: If) -> None:
         """
         if test:
             body
         [elif/else modelados en node.orelse]
+
+        Sin orelse (el caso común) solo hace falta una etiqueta de salida:
+
+            if_false cond goto L_end_if
+            ... body ...
+        L_end_if:
+
+        Con orelse:
+
+            if_false cond goto L_else
+            ... body ...
+            goto L_end_if
+        L_else:
+            ... orelse ...
+        L_end_if:
         """
         cond_place = self.visit_expr(node.test)
+
+        if not node.orelse:
+            label_end = self.new_label("L_end_if_")
+            self.emit_raw(Op.IF_FALSE_GOTO, cond_place, None, label_end, None, None)
+            self.visit_body(node.body)
+            self.emit_label(label_end)
+            return
+
         label_else = self.new_label("L_else_")
         label_end = self.new_label("L_end_if_")
 
         # if_false cond goto else
-        self.emit("if_false_goto", arg1=cond_place, result=label_else)
-
-        # cuerpo del if
-        for stmt in node.body:
-            self.visit_stmt(stmt)
+        self.emit_raw(Op.IF_FALSE_GOTO, cond_place, None, label_else, None, None)
 
-        # salto a fin si hay orelse
-        if node.orelse:
-            self.emit("goto", result=label_end)
+        # cuerpo del if, y salto al final
+        self.visit_body(node.body)
+        self.emit_raw(Op.GOTO, None, None, label_end, None, None)
 
         # else / elif
         self.emit_label(label_else)
-        for stmt in node.orelse:
-            self.visit_stmt(stmt)
-
-        if node.orelse:
-            self.emit_label(label_end)
+        self.visit_body(node.orelse)
+        self.emit_label(label_end)
 
     def visit_while(self, node: While) -> None:
         """
@@ -338,28 +708,32 @@ class CodeGenerator3AC:
             body
         [else: ...] (no implementamos else en 3AC; se puede extender)
         """
+        # Locales para no repetir la búsqueda de atributos en cada uso
+        emit = self.emit_raw
+        bs = self.break_stack
+        cs = self.continue_stack
+
         label_start = self.new_label("L_while_start_")
         label_end = self.new_label("L_while_end_")
 
         # Registrar labels de bucle
-        self.continue_stack.append(label_start)
-        self.break_stack.append(label_end)
+        cs.append(label_start)
+        bs.append(label_end)
 
         self.emit_label(label_start)
         cond_place = self.visit_expr(node.test)
-        self.emit("if_false_goto", arg1=cond_place, result=label_end)
+        emit(Op.IF_FALSE_GOTO, cond_place, None, label_end, None, None)
 
-        for stmt in node.body:
-            self.visit_stmt(stmt)
+        self.visit_body(node.body)
 
         # continue salta aquí (label_start)
-        self.emit("goto", result=label_start)
+        emit(Op.GOTO, None, None, label_start, None, None)
 
         self.emit_label(label_end)
 
         # Pop de stacks de bucle
-        self.continue_stack.pop()
-        self.break_stack.pop()
+        cs.pop()
+        bs.pop()
 
         # (Opcional) while-else se podría implementar aquí usando node.orelse
 
@@ -381,50 +755,51 @@ class CodeGenerator3AC:
             goto L_for_start
         L_for_end:
         """
+        # Locales para no repetir la búsqueda de atributos en cada uso
+        emit = self.emit_raw
+        bs = self.break_stack
+        cs = self.continue_stack
+
         iter_place = self.visit_expr(node.iter)
         idx = self.new_temp()
         length = self.new_temp()
-
-        # i = 0
-        self.emit("=", arg1="0", result=idx, comment="for index")
-        # n = len(it)
-        self.emit("len", arg1=iter_place, result=length, comment="len(iter)")
-
         label_start = self.new_label("L_for_start_")
         label_end = self.new_label("L_for_end_")
+        cond = self.new_temp()
 
-        self.continue_stack.append(label_start)
-        self.break_stack.append(label_end)
+        cs.append(label_start)
+        bs.append(label_end)
 
-        self.emit_label(label_start)
-
-        # cond = i < n
-        cond = self.new_temp()
-        self.emit("<", arg1=idx, arg2=length, result=cond)
-        self.emit("if_false_goto", arg1=cond, result=label_end)
+        # Cabecera del bucle en un solo bloque
+        self.emit_many((
+            (Op.ASSIGN, "0", None, idx, None, "for index"),        # i = 0
+            (Op.LEN, iter_place, None, length, None, "len(iter)"),  # n = len(it)
+            (Op.LABEL, None, None, None, label_start, None),
+            (Op.LT, idx, length, cond, None, None),                 # cond = i < n
+            (Op.IF_FALSE_GOTO, cond, None, label_end, None, None),
+        ))
 
         # v = it[i]
         value_temp = self.new_temp()
-        self.emit("load_index", arg1=iter_place, arg2=idx, result=value_temp)
+        emit(Op.LOAD_INDEX, iter_place, idx, value_temp, None, None)
 
         # target = v
         target_place = self.get_lvalue_place(node.target)
-        self.emit("=", arg1=value_temp, result=target_place)
+        emit(Op.ASSIGN, value_temp, None, target_place, None, None)
 
         # cuerpo del for
-        for stmt in node.body:
-            self.visit_stmt(stmt)
+        self.visit_body(node.body)
 
         # i = i + 1
         t = self.new_temp()
-        self.emit("+", arg1=idx, arg2="1", result=t)
-        self.emit("=", arg1=t, result=idx)
+        emit(Op.ADD, idx, "1", t, None, None)
+        emit(Op.ASSIGN, t, None, idx, None, None)
 
-        self.emit("goto", result=label_start)
+        emit(Op.GOTO, None, None, label_start, None, None)
         self.emit_label(label_end)
 
-        self.continue_stack.pop()
-        self.break_stack.pop()
+        cs.pop()
+        bs.pop()
 
     def visit_functiondef(self, node: FunctionDef) -> None:
         """
@@ -434,142 +809,174 @@ class CodeGenerator3AC:
         """
         func_name = node.name
 
-        # Inicio de función
-        self.emit("func_begin", result=func_name)
-
-        # Parámetros (no es obligatorio emitir nada, pero podemos listar param)
-        for arg in node.args.args:
-            # param nombre_param
-            self.emit("param", arg1=arg.name, comment="func param")
+        # Inicio de función y parámetros (no es obligatorio emitir nada,
+        # pero podemos listar param nombre_param), en un solo bloque
+        header = [(Op.FUNC_BEGIN, None, None, func_name, None, None)]
+        for arg in node.args:
+            header.append((Op.PARAM, arg.name, None, None, None, "func param"))
+        self.emit_many(header)
 
         # Cuerpo de la función
-        for stmt in node.body:
-            self.visit_stmt(stmt)
+        self.visit_body(node.body)
 
-        # Asegurar un return implícito si no se emitió ninguno explícito
-        # (No lo detectamos exactamente; solo añadimos uno vacío al final)
-        self.emit("return", comment="implicit return")
+        # Return implícito, salvo que el cuerpo ya termine en un return.
+        # (Si detrás del return quedó una etiqueta, se puede llegar al final
+        # por un salto y el return implícito sigue haciendo falta.)
+        if self.program.ops[-1] != Op.RETURN:
+            self.emit_raw(Op.RETURN, None, None, None, None, "implicit return")
 
-        self.emit("func_end", result=func_name)
+        self.emit_raw(Op.FUNC_END, None, None, func_name, None, None)
 
     # ------ Expresiones ------
     def visit_expr(self, node: Expr) -> str:
-        if isinstance(node, Name):
-            return node.id
-        if isinstance(node, Num):
-            # Usamos el literal directo como constante
-            return repr(node.value)
-        if isinstance(node, Str):
-            return repr(node.value)
-        if isinstance(node, Bool):
-            return "True" if node.value else "False"
-        if isinstance(node, NoneLiteral):
-            return "None"
-        if isinstance(node, BinOp):
-            return self.visit_binop(node)
-        if isinstance(node, UnaryOp):
-            return self.visit_unaryop(node)
-        if isinstance(node, BoolOp):
-            return self.visit_boolop(node)
-        if isinstance(node, Compare):
-            return self.visit_compare(node)
-        if isinstance(node, Call):
-            return self.visit_call(node)
-        if isinstance(node, Attribute):
-            return self.visit_attribute(node)
-        if isinstance(node, Subscript):
-            return self.visit_subscript(node)
-
-        raise NotImplementedError(f"Expresión no soportada en 3AC: {type(node).__name__}")
-
-    def visit_binop(self, node: BinOp) -> str:
-        left_place = self.visit_expr(node.left)
-        right_place = self.visit_expr(node.right)
-        result = self.new_temp()
-        self.emit(node.op, arg1=left_place, arg2=right_place, result=result)
-        return result
-
-    def visit_unaryop(self, node: UnaryOp) -> str:
-        operand_place = self.visit_expr(node.operand)
-        result = self.new_temp()
-        # op puede ser '+', '-', '~', 'not'
-        self.emit(node.op, arg1=operand_place, result=result)
-        return result
-
-    def visit_boolop(self, node: BoolOp) -> str:
-        """
-        Para simplificar, no implementamos short-circuiting real.
-        Aproximamos: t = v1 op v2 op v3 ...
         """
-        if not node.values:
-            # Caso degenerado (no debería ocurrir)
-            return "False"
+        Evalúa una expresión y devuelve su "place" (nombre, temporal o literal).
 
-        temp = self.visit_expr(node.values[0])
+        Los nodos compuestos (BinOp, UnaryOp, BoolOp, Compare, Call) se
+        recorren de forma iterativa con una pila explícita de (nodo, estado)
+        en vez de recursión: cada hijo deja su place en `places` y el padre,
+        al volver a salir de la pila, los consume y emite su instrucción.
+        Así evitamos un frame de Python por nodo y el límite de recursión en
+        expresiones largas (a + b + c + ...).
 
-        for expr in node.values[1:]:
-            right = self.visit_expr(expr)
-            t = self.new_temp()
-            self.emit(node.op, arg1=temp, arg2=right, result=t)
-            temp = t
-
-        return temp
-
-    def visit_compare(self, node: Compare) -> str:
+        El orden de evaluación y de emisión es el mismo que en un recorrido
+        recursivo en profundidad.
         """
-        Comparaciones encadenadas: a < b < c
-        Implementación aproximada:
-            t1 = a < b
-            t2 = t1 < c   (no equivalente a Python real, pero sirve como IR simple)
-        """
-        left_place = self.visit_expr(node.left)
-
-        if not node.ops or not node.comparators:
-            return left_place
+        dispatch = self._expr_dispatch
+        emit = self.emit_raw
+        new_temp = self.new_temp
+        work = [(node, 0)]
+        places: List[str] = []
+
+        while work:
+            node, state = work.pop()
+            t = type(node)
+
+            if t is BinOp:
+                if state == 0:
+                    op = node.op
+                    left = node.left
+                    if op in _FOLDABLE_OPS and type(left) is BinOp and left.op == op:
+                        # Cadena a op b op c ...: recogemos la espina izquierda
+                        # y la evaluamos como un solo pliegue (ver _BinChain)
+                        operands = [node.right]
+                        while type(left) is BinOp and left.op == op:
+                            operands.append(left.right)
+                            left = left.left
+                        operands.append(left)
+                        operands.reverse()
+                        work.append((_BinChain(op, operands), 0))
+                        continue
+                    # left se evalúa antes que right (se apila al final)
+                    work.append((node, 1))
+                    work.append((node.right, 0))
+                    work.append((left, 0))
+                else:
+                    right = places.pop()
+                    left = places.pop()
+                    result = new_temp()
+                    emit(OP_FROM_STR[node.op], left, right, result, None, None)
+                    places.append(result)
+
+            elif t is UnaryOp:
+                if state == 0:
+                    work.append((node, 1))
+                    work.append((node.operand, 0))
+                else:
+                    operand = places.pop()
+                    result = new_temp()
+                    # op puede ser '+', '-', '~', 'not'
+                    emit(OP_FROM_STR[node.op], operand, None, result, None, None)
+                    places.append(result)
+
+            elif t is BoolOp or t is _BinChain:
+                # Sin short-circuit real: t = v1 op v2 op v3 ...
+                # estado k => ya se evaluaron values[0..k-1]
+                values = node.values
+                if state == 0 and not values:
+                    # Caso degenerado (no debería ocurrir)
+                    places.append("False")
+                    continue
+                if state >= 2:
+                    right = places.pop()
+                    left = places.pop()
+                    # Solo la primera operación pide temporal; las siguientes
+                    # acumulan sobre él (t = t op v).
+                    result = new_temp() if state == 2 else left
+                    emit(OP_FROM_STR[node.op], left, right, result, None, None)
+                    places.append(result)
+                if state < len(values):
+                    work.append((node, state + 1))
+                    work.append((values[state], 0))
+
+            elif t is Compare:
+                # Comparaciones encadenadas a < b < c, aproximadas como
+                #   t1 = a < b ; t2 = t1 < c
+                # (no equivalente a Python real, pero sirve como IR simple)
+                # estado k => ya se evaluaron left y comparators[0..k-2]
+                n = min(len(node.ops), len(node.comparators))
+                if state >= 2:
+                    right = places.pop()
+                    left = places.pop()
+                    result = new_temp()
+                    emit(OP_FROM_STR[node.ops[state - 2]], left, right, result, None, None)
+                    places.append(result)
+                if state == 0:
+                    work.append((node, 1))
+                    work.append((node.left, 0))
+                elif state <= n:
+                    work.append((node, state + 1))
+                    work.append((node.comparators[state - 1], 0))
+
+            elif t is Call:
+                # result = call func, n_args  (precedido de param arg_i)
+                # Primero se evalúan todos los argumentos (así los param de
+                # una llamada anidada no se mezclan con los de esta) y luego
+                # sus param salen juntos, leyendo los places directamente de
+                # la cima de `places`.
+                # NOTA: ignoramos por ahora los keyword args (solo posicionales).
+                # estado 1 => argumentos evaluados; estado 2 => func evaluada
+                args = node.args
+                n_args = len(args)
+                if state == 0:
+                    work.append((node, 1))
+                    work.extend((arg, 0) for arg in reversed(args))
+                elif state == 1:
+                    if n_args:
+                        self.emit_many([(Op.PARAM, p, None, None, None, None) for p in places[-n_args:]])
+                        del places[-n_args:]
+                    work.append((node, 2))
+                    work.append((node.func, 0))
+                else:
+                    func_place = places.pop()
+                    result = new_temp()
+                    emit(Op.CALL, func_place, str(n_args), result, None, None)
+                    places.append(result)
 
-        temp = None
-        current_left = left_place
+            else:
+                # Hojas (Name, literales) y nodos sin recorrido propio
+                fn = dispatch.get(t)
+                if fn is None:
+                    raise NotImplementedError(f"Expresión no soportada en 3AC: {t.__name__}")
+                places.append(fn(node))
 
-        for op_str, right_expr in zip(node.ops, node.comparators):
-            right_place = self.visit_expr(right_expr)
-            t = self.new_temp()
-            self.emit(op_str, arg1=current_left, arg2=right_place, result=t)
-            temp = t
-            current_left = temp
+        return places[-1]
 
-        return temp if temp is not None else left_place
+    def visit_name(self, node: Name) -> str:
+        return node.id
 
-    def visit_call(self, node: Call) -> str:
-        """
-        Llamada a función:
+    def visit_num(self, node: Num) -> str:
+        # Usamos el literal directo como constante
+        return _literal_place(self._literal_cache, Num, node.value)
 
-            result = call func, n_args
-
-        Previamente emitimos:
-            param arg1
-            param arg2
-            ...
-        NOTA: ignoramos por ahora los keyword args (solo posicionales).
-        """
-        # Primero evaluamos los args posicionales
-        arg_places: List[str] = []
-        for arg in node.args:
-            arg_places.append(self.visit_expr(arg))
+    def visit_str(self, node: Str) -> str:
+        return _literal_place(self._literal_cache, Str, node.value)
 
-        # Emitimos param para cada arg
-        for place in arg_places:
-            self.emit("param", arg1=place)
+    def visit_bool(self, node: Bool) -> str:
+        return "True" if node.value else "False"
 
-        # Nombre o expresión de la función
-        func_place = self.visit_expr(node.func)
-
-        # Número de args posicionales (ignoramos keywords en esta IR)
-        n_args = len(arg_places)
-
-        result = self.new_temp()
-        self.emit("call", arg1=func_place, arg2=str(n_args), result=result)
-
-        return result
+    def visit_none(self, node: NoneLiteral) -> str:
+        return "None"
 
     def visit_attribute(self, node: Attribute) -> str:
         """
@@ -577,7 +984,7 @@ class CodeGenerator3AC:
         """
         value_place = self.visit_expr(node.value)
         result = self.new_temp()
-        self.emit("getattr", arg1=value_place, arg2=node.attr, result=result)
+        self.emit_raw(Op.GETATTR, value_place, node.attr, result, None, None)
         return result
 
     def visit_subscript(self, node: Subscript) -> str:
@@ -585,6 +992,13 @@ class CodeGenerator3AC:
         value[slice] -> aquí suponemos slice simple: start, sin stop/step.
         Si es start, stop, step, podrías mapear a una operación de slice.
         """
+        simple = _simple_index(node, self._literal_cache)
+        if simple is not None:
+            # nombre[nombre] / nombre[literal]: places directos, sin visit_expr
+            result = self.new_temp()
+            self.emit_raw(Op.LOAD_INDEX, simple[0], simple[1], result, None, None)
+            return result
+
         value_place = self.visit_expr(node.value)
         s = node.slice
 
@@ -592,7 +1006,7 @@ class CodeGenerator3AC:
         if s.start is not None and s.stop is None and s.step is None:
             index_place = self.visit_expr(s.start)
             result = self.new_temp()
-            self.emit("load_index", arg1=value_place, arg2=index_place, result=result)
+            self.emit_raw(Op.LOAD_INDEX, value_place, index_place, result, None, None)
             return result
 
         # Si es un slice completo, usamos un op abstracto "slice"
@@ -603,7 +1017,7 @@ class CodeGenerator3AC:
         result = self.new_temp()
         # Para simplificar, empaquetamos los tres en un pseudo-arg
         slice_descr = f"({start},{stop},{step})"
-        self.emit("slice", arg1=value_place, arg2=slice_descr, result=result)
+        self.emit_raw(Op.SLICE, value_place, slice_descr, result, None, None)
         return result
 
     # ==========================================================
@@ -624,10 +1038,11 @@ class CodeGenerator3AC:
 
         Para uso simple (Asigna a Name), basta con devolver expr.id
         """
-        if isinstance(expr, Name):
+        t = type(expr)
+        if t is Name:
             return expr.id
 
-        if isinstance(expr, Attribute):
+        if t is Attribute:
             # obj.attr = value  -> store_attr obj, 'attr', value
             # Aquí devolvemos algo simbólico, pero lo normal será que
             # el generador de asignación use esto de forma directa.
@@ -637,7 +1052,10 @@ class CodeGenerator3AC:
             # construimos algo como "base.attr" solo como etiqueta
             return f"{base}.{expr.attr}"
 
-        if isinstance(expr, Subscript):
+        if t is Subscript:
+            simple = _simple_index(expr, self._literal_cache)
+            if simple is not None:
+                return f"{simple[0]}[{simple[1]}]"
             base = self.visit_expr(expr.value)
             s = expr.slice
             if s.start is not None and s.stop is None and s.step is None:
@@ -656,7 +1074,7 @@ class CodeGenerator3AC:
 #  Helper de uso rápido
 # ==========================================================
 
-def generate_3ac(program: Program) -> List[TACInstr]:
+def generate_3ac(program: Program) -> TACProgram:
     """
     Función de conveniencia:
         ast = parse_tokens(tokens)
@@ -0,0 +1,14 @@
+# lexer.pxd: declaraciones Cython para lexer.py (ver setup.py)
+
+cdef class Lexer:
+    cdef public str text
+    cdef public str filename
+    cdef public Py_ssize_t pos
+    cdef public Py_ssize_t length
+    cdef list _line_starts
+    cdef public object indent_stack
+    cdef public int indent_top
+    cdef public bint at_line_start
+    cdef object _master
+
+    cpdef tuple _loc(self, Py_ssize_t pos)
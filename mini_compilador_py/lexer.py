@@ -24,9 +24,15 @@ Uso típico:
 
 from __future__ import annotations
 
-from typing import List, Optional
+import re
+import sys
+from array import array
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 from tokens import (
     Token,
+    KEYWORD_TYPES,
+    offset_to_position,
     # Tokens básicos
     TT_NAME, TT_NUMBER, TT_STRING,
     TT_NEWLINE, TT_INDENT, TT_DEDENT, TT_TYPE_COMMENT,
@@ -47,6 +53,139 @@ from tokens import (
 )
 
 
+# =========================
+#  Operadores y signos
+# =========================
+
+# Operadores multi-char (greedy matching: se prueban antes que los simples)
+_MULTI_OPS = {
+    '>>=': TT_RSHIFTEQUAL,
+    '<<=': TT_LSHIFTEQUAL,
+    '**=': TT_DOUBLE_STAREQUAL,
+    '//=': TT_DOUBLE_SLASHEQUAL,
+    '==': TT_EQEQUAL,
+    '!=': TT_NOTEQUAL,
+    '<=': TT_LESSEQUAL,
+    '>=': TT_GREATEREQUAL,
+    '<<': TT_LSHIFT,
+    '>>': TT_RSHIFT,
+    '**': TT_DOUBLE_STAR,
+    '//': TT_DOUBLE_SLASH,
+    '+=': TT_PLUSEQUAL,
+    '-=': TT_MINEQUAL,
+    '*=': TT_STAREQUAL,
+    '/=': TT_SLASHEQUAL,
+    '%=': TT_PERCENTEQUAL,
+    '@=': TT_ATEQUAL,
+    '&=': TT_AMPEREQUAL,
+    '|=': TT_PIPEEQUAL,
+    '^=': TT_CARETEQUAL,
+    '->': TT_ARROW,
+}
+
+# Operadores de 1 caracter y signos
+_SINGLE_MAP = {
+    '+': TT_PLUS,
+    '-': TT_MINUS,
+    '*': TT_STAR,
+    '/': TT_SLASH,
+    '%': TT_PERCENT,
+    '@': TT_AT,
+    '|': TT_PIPE,
+    '&': TT_AMPERSAND,
+    '^': TT_CARET,
+    '~': TT_TILDE,
+    '=': TT_EQUAL,
+    '<': TT_LESS,
+    '>': TT_GREATER,
+    '(': TT_LPAREN,
+    ')': TT_RPAREN,
+    '[': TT_LBRACKET,
+    ']': TT_RBRACKET,
+    '{': TT_LBRACE,
+    '}': TT_RBRACE,
+    ',': TT_COMMA,
+    ':': TT_COLON,
+    ';': TT_SEMI,
+    '.': TT_DOT,
+}
+
+# Lexema -> tipo de token, para todos los operadores y signos
+_OP_TYPES: Dict[str, int] = {**_MULTI_OPS, **_SINGLE_MAP}
+
+# Tabla indexada por ord(c) (ASCII) con el tipo de token de los signos que
+# siempre son un token completo de 1 carácter: ninguno empieza un operador
+# multi-char ni un número. Para ellos no hace falta pasar por _MASTER.
+# Es un bytearray (los tipos son ints < 256) con 0 como "no es un signo".
+# Ej.: _SINGLE_TT[ord('(')] == TT_LPAREN, _SINGLE_TT[ord('<')] == 0
+_SINGLE_TT = bytearray(128)
+for _ch, _tt in _SINGLE_MAP.items():
+    if _ch != '.' and not any(op[0] == _ch for op in _MULTI_OPS):
+        _SINGLE_TT[ord(_ch)] = _tt
+del _ch, _tt
+
+
+# =========================
+#  Patrones precompilados
+# =========================
+# Todo el escaneo de tokens corre dentro del motor de regex en C: una sola
+# alternativa grande (_MASTER) reconoce el siguiente token y m.lastgroup
+# dice de qué clase es. Python solo decide qué hacer con cada match.
+
+# Operadores del más largo al más corto (greedy: '**=' antes que '**')
+_OP_PATTERN = '|'.join(
+    re.escape(op) for op in sorted(_OP_TYPES, key=len, reverse=True)
+)
+
+_MASTER_PATTERN = (
+    r"(?P<NAME>[^\W\d]\w*)"                 # letra o '_' y luego \w*
+    # Mantisa (123, 1.23, 5., .5) con exponente opcional; BADEXP captura
+    # una 'e' sin dígitos detrás para reportar el error
+    r"|(?P<NUMBER>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+|(?P<BADEXP>[eE][+-]?))?)"
+    rf"|(?P<OP>{_OP_PATTERN})"
+    r"|(?P<WS>[ \t]+)"
+    r"|(?P<NEWLINE>\n)"
+    r"|(?P<STRING>\"[^\"\\\n]*\"|'[^'\\\n]*')"  # cadena sin escapes
+    # '# type: ...' (se ignoran los '#' y blancos iniciales; TC es el texto
+    # desde 'type:' hasta el fin de línea). Cualquier otro comentario se
+    # salta sin extraer su texto.
+    r"|(?P<TYPE_COMMENT>\#+[^\S\n]*(?P<TC>type:[^\n]*))"
+    r"|(?P<COMMENT>\#[^\n]*)"
+    r"|(?P<QUOTE>[\"'])"                      # cadena con escapes o sin cerrar
+)
+
+_MASTER = re.compile(_MASTER_PATTERN)
+# Misma gramática para fuentes solo-ASCII (el caso normal): con re.ASCII,
+# \w y \d son clases de bytes simples y el motor no consulta la base de
+# datos Unicode en cada carácter.
+_MASTER_ASCII = re.compile(_MASTER_PATTERN, re.ASCII)
+
+_INDENT_RE = re.compile(r'[ \t]*')
+
+# Saltos de línea, para armar la tabla de líneas dentro del motor de regex
+_NEWLINE_RE = re.compile('\n')
+
+# Capacidad inicial de la pila de indentaciones (crece si hace falta)
+_INDENT_STACK_SIZE = 64
+
+# Escapes simples de cadena: carácter tras '\\' -> carácter resultante.
+# Cualquier otro (incluida la propia comilla) se conserva tal cual.
+_ESCAPES: Dict[str, str] = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}
+
+# Semilla de la caché de nombres de itokenize: lexema -> (tipo, str
+# internado), con las keywords que tienen tipo propio ya cargadas
+_KEYWORD_NAMES: Dict[str, Tuple[int, str]] = {
+    sys.intern(word): (tt, sys.intern(word)) for word, tt in KEYWORD_TYPES.items()
+}
+
+# Operador -> (tipo, lexema canónico). El valor del token es este str
+# compartido, no el que devuelve m.group(): un '==' o un '+=' no crean
+# un string nuevo por aparición.
+_OP_TOKENS: Dict[str, Tuple[int, str]] = {
+    op: (tt, sys.intern(op)) for op, tt in _OP_TYPES.items()
+}
+
+
 class LexerError(Exception):
     """Error léxico con información de línea y columna."""
 
@@ -58,15 +197,36 @@ class LexerError(Exception):
 
 class Lexer:
     def __init__(self, text: str, filename: str = "<stdin>"):
+        # Pila de indentaciones (en espacios): array de enteros C preasignado
+        # e índice del tope; apilar/desapilar solo mueve indent_top
+        self.indent_stack = array('i', bytes(4 * _INDENT_STACK_SIZE))
+        self.indent_top = 0
+        self._reset(text, filename)
+
+    def _reset(self, text: str, filename: str = "<stdin>") -> None:
+        """Prepara el lexer para tokenizar `text` reutilizando su pila de indentación."""
+        # Normalizamos los saltos de línea una sola vez ('\r\n' y '\r' -> '\n'),
+        # así el bucle principal no tiene que tratar '\r' en ningún lado
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
         self.text = text
         self.filename = filename
         self.pos = 0
-        self.line = 1
-        self.col = 1
         self.length = len(text)
+        self._master = _MASTER_ASCII if text.isascii() else _MASTER
+
+        # Posiciones de cada '\n' (con -1 como inicio virtual de la línea 1).
+        # Los tokens guardan solo su offset y una referencia a esta lista;
+        # su línea/columna se calcula con bisect cuando alguien la pide.
+        # Es una lista nueva por texto: los tokens de un archivo anterior
+        # siguen apuntando a la suya aunque el lexer se reutilice.
+        line_starts = [-1]
+        line_starts.extend([m.start() for m in _NEWLINE_RE.finditer(text)])
+        self._line_starts = line_starts
 
         # Pila de indentaciones (en espacios). Comienza en 0.
-        self.indent_stack = [0]
+        self.indent_stack[0] = 0
+        self.indent_top = 0
 
         # Flag para saber si estamos al inicio lógico de una línea
         self.at_line_start = True
@@ -75,427 +235,319 @@ class Lexer:
     #  Helpers básicos
     # =========================
 
-    @property
-    def current_char(self) -> Optional[str]:
-        if self.pos >= self.length:
-            return None
-        return self.text[self.pos]
-
-    def _advance(self, n: int = 1):
-        for _ in range(n):
-            if self.pos >= self.length:
-                return
-            ch = self.text[self.pos]
-            self.pos += 1
-            if ch == '\n':
-                self.line += 1
-                self.col = 1
-            else:
-                self.col += 1
-
-    def _peek(self, k: int = 1) -> Optional[str]:
-        idx = self.pos + k
-        if idx >= self.length:
-            return None
-        return self.text[idx]
+    def _loc(self, pos: int) -> Tuple[int, int]:
+        """
+        Devuelve (línea, columna), ambas 1-based, de la posición pos
+        (para los mensajes de LexerError).
+        """
+        return offset_to_position(self._line_starts, pos)
 
     # =========================
     #  Tokenización principal
     # =========================
 
     def tokenize(self) -> List[Token]:
-        tokens: List[Token] = []
+        """Devuelve la lista completa de tokens (ver itokenize)."""
+        return list(self.itokenize())
 
-        while True:
-            ch = self.current_char
-            if ch is None:
-                break
-
-            if self.at_line_start:
+    def itokenize(self) -> Iterator[Token]:
+        """
+        Genera los tokens uno a uno, a medida que se escanean. El parser
+        puede consumirlos en streaming sin que exista la lista completa.
+        """
+        # Estado del bucle en variables locales (LOAD_FAST en lugar de
+        # self.x); se vuelca a self al salir
+        text = self.text
+        length = self.length
+        match = self._master.match
+        line_starts = self._line_starts
+        single_tt = _SINGLE_TT
+        op_tokens = _OP_TOKENS
+        # Caché de nombres de esta pasada: lexema -> (tipo, str internado).
+        # Un identificador repetido se resuelve con una sola consulta, sin
+        # llamar de nuevo a sys.intern ni buscarlo entre las keywords.
+        names = dict(_KEYWORD_NAMES)
+        names_get = names.get
+        pos = self.pos
+        at_line_start = self.at_line_start
+        last: Optional[Token] = None  # último token emitido
+
+        while pos < length:
+            if at_line_start:
                 # Manejar indentación y líneas en blanco/comentarios
-                self._handle_line_start(tokens)
-                ch = self.current_char
-                if ch is None:
+                at_line_start = False
+                pos, tok, count = self._handle_line_start(pos)
+                if count:
+                    # Los count tokens son la misma instancia: un solo
+                    # yield from sobre una tupla en lugar de un bucle
+                    yield from (tok,) * count
+                    last = tok
+                if pos >= length:
                     break
 
-            # Espacios en medio de la línea
-            if ch in ' \t\r':
-                self._advance()
+            # Signos de 1 carácter ( ) [ ] { } , : ; ~ : una consulta en la
+            # tabla por código de carácter, sin regex
+            ch = text[pos]
+            code = ord(ch)
+            if code < 128:
+                tt = single_tt[code]
+                if tt:
+                    tok = Token(tt, ch, pos, line_starts)
+                    yield tok
+                    last = tok
+                    pos += 1
+                    continue
+
+            m = match(text, pos)
+            if m is None:
+                # Si nada matchea, es un error
+                raise LexerError(f"Carácter inesperado: {repr(text[pos])}", *self._loc(pos))
+
+            kind = m.lastgroup
+            end = m.end()
+
+            if kind == 'NAME':
+                # Internamos el nombre: keywords y nombres repetidos comparten
+                # un único str. Las keywords del parser llevan su TT_KW_*.
+                lexeme = m.group()
+                hit = names_get(lexeme)
+                if hit is None:
+                    hit = names[lexeme] = (TT_NAME, sys.intern(lexeme))
+                tok = Token(hit[0], hit[1], pos, line_starts)
+            elif kind == 'OP':
+                hit = op_tokens[m.group()]
+                tok = Token(hit[0], hit[1], pos, line_starts)
+            elif kind == 'WS':
+                # Espacios en medio de la línea
+                pos = end
                 continue
-
-            # Comentarios
-            if ch == '#':
-                self._handle_comment(tokens)
-                continue
-
-            # Nueva línea
-            if ch == '\n':
-                # Emitimos NEWLINE solo si no estamos "al inicio" por indent
-                tok = Token(TT_NEWLINE, '\n', self.line, self.col)
-                tokens.append(tok)
-                self._advance()
-                self.at_line_start = True
-                continue
-
-            # Números
-            if ch.isdigit() or (ch == '.' and (self._peek() or '').isdigit()):
-                tokens.append(self._number())
-                continue
-
-            # Identificadores / keywords
-            if ch.isalpha() or ch == '_':
-                tokens.append(self._identifier_or_keyword())
-                continue
-
-            # Cadenas de texto (simples, no fstrings avanzados)
-            if ch in ('"', "'"):
-                tokens.append(self._string_literal())
+            elif kind == 'NUMBER':
+                tok = self._number(m)
+            elif kind == 'NEWLINE':
+                tok = Token(TT_NEWLINE, '\n', pos, line_starts)
+                at_line_start = True
+            elif kind == 'STRING':
+                # Sin escapes: el valor es el texto entre comillas
+                tok = Token(TT_STRING, text[pos + 1:end - 1], pos, line_starts)
+            elif kind == 'COMMENT':
+                # Comentario normal: se ignora (no consume el '\n')
+                pos = end
                 continue
+            elif kind == 'TYPE_COMMENT':
+                tok = Token(TT_TYPE_COMMENT, m.group('TC'), pos, line_starts)
+            else:
+                # QUOTE: cadena con escapes (o mal cerrada), camino lento
+                tok, end = self._string_literal(pos)
 
-            # Operadores y signos
-            op_token = self._operator_or_punct()
-            if op_token is not None:
-                tokens.append(op_token)
-                continue
+            yield tok
+            last = tok
+            pos = end
 
-            # Si nada matchea, es un error
-            raise LexerError(f"Carácter inesperado: {repr(ch)}", self.line, self.col)
+        self.pos = pos
+        self.at_line_start = at_line_start
 
         # Al final del archivo: emitir NEWLINE si la última línea no termina
         # con salto (esto ayuda al parser estilo Python)
-        if tokens and tokens[-1].type != TT_NEWLINE:
-            tokens.append(Token(TT_NEWLINE, '\n', self.line, self.col))
+        if last is not None and last.type != TT_NEWLINE:
+            yield Token(TT_NEWLINE, '\n', pos, line_starts)
 
-        # DEDENTs pendientes
-        while len(self.indent_stack) > 1:
-            self.indent_stack.pop()
-            tokens.append(Token(TT_DEDENT, None, self.line, self.col))
+        # DEDENTs pendientes (todos iguales: comparten una sola instancia)
+        if self.indent_top:
+            yield from (Token(TT_DEDENT, None, pos, line_starts),) * self.indent_top
+            self.indent_top = 0
 
         # ENDMARKER
-        tokens.append(Token(TT_ENDMARKER, None, self.line, self.col))
-        return tokens
+        yield Token(TT_ENDMARKER, None, pos, line_starts)
 
     # =========================
     #  Inicio de línea / indent
     # =========================
 
-    def _handle_line_start(self, tokens: List[Token]):
+    def _handle_line_start(self, start_pos: int) -> Tuple[int, Optional[Token], int]:
         """
-        Maneja indentación al inicio lógico de una línea:
+        Maneja indentación al inicio lógico de una línea (que empieza en
+        start_pos):
         - Cuenta espacios y tabs hasta el primer no-blanco (o fin de línea).
         - Si la línea es solo comentario o solo whitespace, no cambia indent.
         - Si es una línea real de código, emite INDENT/DEDENT según cambios.
+        Devuelve (pos, tok, count): la posición tras la indentación y el
+        token INDENT/DEDENT que hay que emitir `count` veces (0 si ninguno).
         """
-        self.at_line_start = False
-        start_line = self.line
-        start_col = self.col
-
-        indent = 0
-        pos_backup = self.pos
-        col_backup = self.col
+        text = self.text
 
-        # Contar espacios/tabs
-        while True:
-            ch = self.current_char
-            if ch in (' ', '\t'):
-                if ch == ' ':
-                    indent += 1
-                    self._advance()
-                elif ch == '\t':
-                    # Para simplificar, tratamos tab como 4 espacios
-                    indent += 4
-                    self._advance()
-            else:
-                break
-
-        ch = self.current_char
+        # Contar espacios/tabs (para simplificar, tab cuenta como 4 espacios)
+        blanks = _INDENT_RE.match(text, start_pos).group()
+        indent = len(blanks) + 3 * blanks.count('\t')
+        pos = start_pos + len(blanks)
 
         # Línea vacía o solo comentario: no afecta indent, se maneja en el loop principal
-        if ch == '\n' or ch is None or ch == '#':
+        if pos >= self.length or text[pos] in '\n#':
             # No emitimos INDENT/DEDENT
             # Dejamos que NEWLINE y/o comentario se manejen aparte
-            return
+            return pos, None, 0
 
         # Línea con código: comparo indent con la pila
-        prev_indent = self.indent_stack[-1]
+        stack = self.indent_stack
+        top = self.indent_top
+        prev_indent = stack[top]
 
         if indent > prev_indent:
             # Nuevo nivel de indentación
-            self.indent_stack.append(indent)
-            tokens.append(Token(TT_INDENT, None, start_line, start_col))
+            top += 1
+            if top == len(stack):
+                stack.extend(array('i', bytes(4 * len(stack))))
+            stack[top] = indent
+            self.indent_top = top
+            return pos, Token(TT_INDENT, None, start_pos, self._line_starts), 1
         elif indent < prev_indent:
-            # Salimos de uno o más niveles
-            while self.indent_stack and indent < self.indent_stack[-1]:
-                self.indent_stack.pop()
-                tokens.append(Token(TT_DEDENT, None, start_line, start_col))
-
-            if indent != self.indent_stack[-1]:
+            # Salimos de uno o más niveles (el fondo de la pila es 0, así que
+            # el bucle siempre termina). Los DEDENT de una misma línea son
+            # idénticos (tipo, valor y posición), así que comparten instancia.
+            count = 0
+            while indent < stack[top]:
+                top -= 1
+                count += 1
+            self.indent_top = top
+
+            if indent != stack[top]:
                 raise LexerError(
                     "Indentación inválida (no coincide con ningún nivel previo)",
-                    start_line,
-                    start_col,
+                    *self._loc(start_pos),
                 )
+            return pos, Token(TT_DEDENT, None, start_pos, self._line_starts), count
 
         # Si indent == prev_indent, no hacemos nada (misma indentación)
-
-    # =========================
-    #  Comentarios
-    # =========================
-
-    def _handle_comment(self, tokens: List[Token]):
-        """
-        Maneja comentarios:
-        - Si la línea empieza con '# type:', emitimos TYPE_COMMENT.
-        - En otro caso, se ignora el comentario (hasta fin de línea).
-        No consume el '\n'; eso se procesa fuera.
-        """
-        start_line = self.line
-        start_col = self.col
-
-        # Leemos todo el comentario en bruto
-        comment_text = ''
-        while self.current_char is not None and self.current_char != '\n':
-            comment_text += self.current_char
-            self._advance()
-
-        # Normalizamos para detectar "type:"
-        stripped = comment_text.lstrip('#').lstrip()
-
-        if stripped.startswith("type:"):
-            # Emitir TYPE_COMMENT con el texto completo (sin el salto de línea)
-            tokens.append(Token(TT_TYPE_COMMENT, stripped, start_line, start_col))
-        # Si no, el comentario se ignora
+        return pos, None, 0
 
     # =========================
     #  Números
     # =========================
 
-    def _number(self) -> Token:
+    def _number(self, m: re.Match) -> Token:
         """
-        Escanea un NUMBER estilo Python simple:
+        Construye un NUMBER estilo Python simple a partir del match del
+        grupo NUMBER de _MASTER:
         - Enteros: 123
         - Reales: 1.23, 0.5, .5, 5., etc.
         - Con exponente: 1e10, 2.3e-5
         """
-        start_line = self.line
-        start_col = self.col
-
-        num_str = ''
-        ch = self.current_char
-
-        # Caso .123
-        if ch == '.':
-            num_str += ch
-            self._advance()
-            ch = self.current_char
-            if ch is None or not ch.isdigit():
-                raise LexerError("Número inválido después de '.'", start_line, start_col)
-
-        # Parte entera
-        while self.current_char is not None and self.current_char.isdigit():
-            num_str += self.current_char
-            self._advance()
-
-        # Parte fraccionaria
-        if self.current_char == '.':
-            num_str += '.'
-            self._advance()
-            while self.current_char is not None and self.current_char.isdigit():
-                num_str += self.current_char
-                self._advance()
-
-        # Exponente
-        ch = self.current_char
-        if ch in ('e', 'E'):
-            num_str += ch
-            self._advance()
-            ch = self.current_char
-            if ch in ('+', '-'):
-                num_str += ch
-                self._advance()
-            if self.current_char is None or not self.current_char.isdigit():
-                raise LexerError("Exponente inválido en número", self.line, self.col)
-            while self.current_char is not None and self.current_char.isdigit():
-                num_str += self.current_char
-                self._advance()
+        # Exponente: si hay 'e'/'E' tiene que venir seguido de dígitos
+        if m.start('BADEXP') != -1:
+            raise LexerError("Exponente inválido en número", *self._loc(m.end('BADEXP')))
 
         # Convertimos a float (puedes cambiar a int si quieres según formato)
-        try:
-            value = float(num_str)
-        except ValueError:
-            raise LexerError(f"Número inválido: {num_str}", start_line, start_col)
-
-        return Token(TT_NUMBER, value, start_line, start_col)
-
-    # =========================
-    #  Identificadores / NAME
-    # =========================
-
-    def _identifier_or_keyword(self) -> Token:
-        """
-        Escanea un identificador (NAME).
-        No distinguimos aquí keywords: el parser las identifica por el value.
-        """
-        start_line = self.line
-        start_col = self.col
-        ident = ''
-
-        while self.current_char is not None and (
-            self.current_char.isalnum() or self.current_char == '_'
-        ):
-            ident += self.current_char
-            self._advance()
-
-        # type = TT_NAME para todo; el parser revisará value
-        return Token(TT_NAME, ident, start_line, start_col)
+        return Token(TT_NUMBER, float(m.group()), m.start(), self._line_starts)
 
     # =========================
     #  Cadenas STRING (simple)
     # =========================
 
-    def _string_literal(self) -> Token:
+    def _string_literal(self, start_pos: int) -> Tuple[Token, int]:
         """
-        Escanea una cadena de texto delimitada por ' o ".
-        Soporta escapes simples (\\n, \\\\, \", \', etc).
+        Escanea una cadena de texto delimitada por ' o " que empieza en
+        start_pos. Soporta escapes simples (\\n, \\\\, \", \', etc).
         No se manejan f-strings ni prefijos complejos.
+
+        Solo se llama para cadenas con escapes o mal cerradas: las cadenas
+        simples las reconoce directamente _MASTER.
+        Devuelve el token y la posición siguiente a la comilla de cierre.
         """
-        start_line = self.line
-        start_col = self.col
-        quote = self.current_char
-        self._advance()  # Consumir la comilla inicial
+        text = self.text
+        length = self.length
+        quote = text[start_pos]
+        pos = start_pos + 1  # Consumir la comilla inicial
 
         value_chars = []
         while True:
-            ch = self.current_char
-            if ch is None:
-                raise LexerError("Cadena sin cerrar", start_line, start_col)
+            if pos >= length:
+                raise LexerError("Cadena sin cerrar", *self._loc(start_pos))
+            ch = text[pos]
 
             if ch == '\\':
                 # Escape simple
-                self._advance()
-                esc = self.current_char
-                if esc is None:
-                    raise LexerError("Fin de archivo en escape de cadena", self.line, self.col)
-
-                if esc == 'n':
-                    value_chars.append('\n')
-                elif esc == 't':
-                    value_chars.append('\t')
-                elif esc == 'r':
-                    value_chars.append('\r')
-                elif esc == '\\':
-                    value_chars.append('\\')
-                elif esc == quote:
-                    value_chars.append(quote)
-                else:
-                    # Escape genérico: mantenemos el char
-                    value_chars.append(esc)
-                self._advance()
+                pos += 1
+                if pos >= length:
+                    raise LexerError("Fin de archivo en escape de cadena", *self._loc(pos))
+                esc = text[pos]
+
+                # Escape conocido o genérico (mantenemos el char)
+                value_chars.append(_ESCAPES.get(esc, esc))
+                pos += 1
                 continue
 
             if ch == quote:
                 # Fin de cadena
-                self._advance()
+                pos += 1
                 break
 
             if ch == '\n':
-                raise LexerError("Salto de línea dentro de cadena sin cerrar", self.line, self.col)
+                raise LexerError("Salto de línea dentro de cadena sin cerrar", *self._loc(pos))
 
             value_chars.append(ch)
-            self._advance()
+            pos += 1
 
         value = ''.join(value_chars)
-        return Token(TT_STRING, value, start_line, start_col)
-
-    # =========================
-    #  Operadores / Puntuación
-    # =========================
-
-    def _operator_or_punct(self) -> Optional[Token]:
-        """
-        Reconoce operadores y signos de puntuación, prefiriendo
-        siempre el match más largo (por ejemplo '**=' antes que '**').
-        """
-        ch = self.current_char
-        if ch is None:
-            return None
-
-        start_line = self.line
-        start_col = self.col
-
-        # Tabla de operadores multi-char, ordenados por longitud
-        # (para hacer greedy matching).
-        multi_ops = {
-            '>>=': TT_RSHIFTEQUAL,
-            '<<=': TT_LSHIFTEQUAL,
-            '**=': TT_DOUBLE_STAREQUAL,
-            '//=': TT_DOUBLE_SLASHEQUAL,
-            '==': TT_EQEQUAL,
-            '!=': TT_NOTEQUAL,
-            '<=': TT_LESSEQUAL,
-            '>=': TT_GREATEREQUAL,
-            '<<': TT_LSHIFT,
-            '>>': TT_RSHIFT,
-            '**': TT_DOUBLE_STAR,
-            '//': TT_DOUBLE_SLASH,
-            '+=': TT_PLUSEQUAL,
-            '-=': TT_MINEQUAL,
-            '*=': TT_STAREQUAL,
-            '/=': TT_SLASHEQUAL,
-            '%=': TT_PERCENTEQUAL,
-            '@=': TT_ATEQUAL,
-            '&=': TT_AMPEREQUAL,
-            '|=': TT_PIPEEQUAL,
-            '^=': TT_CARETEQUAL,
-            '->': TT_ARROW,
-        }
-
-        # Probamos 3, 2 y 1 caracteres
-        for size in (3, 2):
-            fragment = self._peek_fragment(size)
-            if fragment in multi_ops:
-                tok_type = multi_ops[fragment]
-                self._advance(size)
-                return Token(tok_type, fragment, start_line, start_col)
-
-        # Operadores de 1 caracter y signos
-        single_map = {
-            '+': TT_PLUS,
-            '-': TT_MINUS,
-            '*': TT_STAR,
-            '/': TT_SLASH,
-            '%': TT_PERCENT,
-            '@': TT_AT,
-            '|': TT_PIPE,
-            '&': TT_AMPERSAND,
-            '^': TT_CARET,
-            '~': TT_TILDE,
-            '=': TT_EQUAL,
-            '<': TT_LESS,
-            '>': TT_GREATER,
-            '(': TT_LPAREN,
-            ')': TT_RPAREN,
-            '[': TT_LBRACKET,
-            ']': TT_RBRACKET,
-            '{': TT_LBRACE,
-            '}': TT_RBRACE,
-            ',': TT_COMMA,
-            ':': TT_COLON,
-            ';': TT_SEMI,
-            '.': TT_DOT,
-        }
-
-        if ch in single_map:
-            tok_type = single_map[ch]
-            self._advance()
-            return Token(tok_type, ch, start_line, start_col)
-
-        return None
-
-    def _peek_fragment(self, n: int) -> str:
-        """
-        Devuelve los próximos n caracteres sin avanzar el cursor.
-        Si no hay suficientes caracteres, devuelve la subcadena posible.
-        """
-        end = min(self.pos + n, self.length)
-        return self.text[self.pos:end]
+        return Token(TT_STRING, value, start_pos, self._line_starts), pos
+
+# ==========================================================
+#  Pool de lexers
+# ==========================================================
+
+class LexerPool:
+    """
+    Pool de instancias de Lexer para tokenizar muchos archivos seguidos
+    (tests, re-lexing en un editor, etc.) sin volver a crear cada vez el
+    objeto y su pila de indentación preasignada.
+
+    Uso:
+        with lexer_from_pool(source) as lexer:
+            tokens = lexer.tokenize()
+
+    La lista de tokens devuelta por tokenize es nueva en cada llamada
+    (el parser se queda con ella), así que no forma parte del pool.
+    Si se usa itokenize, el generador debe consumirse dentro del `with`:
+    al salir, el lexer vuelve al pool y puede reutilizarse.
+    """
+
+    def __init__(self, max_size: int = 8):
+        self.max_size = max_size
+        self._free: List[Lexer] = []
+
+    def get(self, text: str, filename: str = "<stdin>") -> Lexer:
+        if self._free:
+            lexer = self._free.pop()
+            lexer._reset(text, filename)
+            return lexer
+        return Lexer(text, filename)
+
+    def put(self, lexer: Lexer) -> None:
+        if len(self._free) < self.max_size:
+            # Soltamos el texto y su tabla de saltos de línea para no
+            # retenerlos en memoria (el estado queda como el de un texto vacío)
+            lexer.text = ''
+            lexer.length = 0
+            lexer._line_starts = [-1]
+            self._free.append(lexer)
+
+
+_POOL = LexerPool()
+
+
+def get_lexer(text: str, filename: str = "<stdin>") -> Lexer:
+    """Devuelve un Lexer del pool global listo para tokenizar `text`."""
+    return _POOL.get(text, filename)
+
+
+def release_lexer(lexer: Lexer) -> None:
+    """Devuelve un Lexer al pool global para reutilizarlo."""
+    _POOL.put(lexer)
+
+
+@contextmanager
+def lexer_from_pool(text: str, filename: str = "<stdin>") -> Iterator[Lexer]:
+    """Context manager: toma un Lexer del pool y lo devuelve al salir."""
+    lexer = get_lexer(text, filename)
+    try:
+        yield lexer
+    finally:
+        release_lexer(lexer)
@@ -22,24 +22,39 @@ Si no pasas flags, se muestran AST y 3AC por defecto.
 from __future__ import annotations
 
 import argparse
+import mmap
 import sys
-from typing import List
 
-from lexer import Lexer
+from lexer import lexer_from_pool
 from parser import Parser
 from astnodes import Program, pretty_print
-from codegen3ac import CodeGenerator3AC, TACInstr
+from codegen3ac import CodeGenerator3AC, TACProgram
 
 
 def read_source(path: str) -> str:
+    """
+    Lee el código fuente. El archivo se mapea en memoria (mmap) y se
+    decodifica directamente desde el mapeo, sin una copia intermedia en
+    bytes; el sistema operativo hace la E/S a través de su caché de páginas.
+    Los saltos de línea ('\r\n', '\r') los normaliza el propio Lexer.
+
+    Si el archivo no se puede mapear (vacío, pipe, FIFO, /dev/stdin...)
+    se lee de la forma normal.
+    """
     if path == "-":
         return sys.stdin.read()
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return f.read().decode("utf-8")
+            with mm:
+                text = str(mm, "utf-8")
     except OSError as e:
         print(f"Error al leer archivo '{path}': {e}", file=sys.stderr)
         sys.exit(1)
+    return text
 
 
 def run_pipeline(
@@ -49,19 +64,21 @@ def run_pipeline(
     show_symtable: bool = False,
     show_3ac: bool = False,
 ) -> None:
-    # 1) LEXER
-    lexer = Lexer(source)
-    tokens = lexer.tokenize()
-
-    if show_tokens:
-        print("=== TOKENS ===")
-        for t in tokens:
-            print(t)
-        print()
+    # 1) LEXER (instancia reutilizada del pool de lexers)
+    with lexer_from_pool(source) as lexer:
+        if show_tokens:
+            tokens = lexer.tokenize()
+            print("=== TOKENS ===")
+            # Un solo write con todos los repr, en lugar de un print por token
+            sys.stdout.write("".join([f"{t!r}\n" for t in tokens]))
+            print()
+        else:
+            # Sin --tokens, el parser consume los tokens en streaming
+            tokens = lexer.itokenize()
 
-    # 2) PARSER (usamos la clase Parser para poder acceder a la tabla de símbolos)
-    parser = Parser(tokens)
-    program: Program = parser.parse()
+        # 2) PARSER (usamos la clase Parser para poder acceder a la tabla de símbolos)
+        parser = Parser(tokens)
+        program: Program = parser.parse()
 
     if show_ast:
         print("=== AST (árbol de sintaxis abstracta) ===")
@@ -87,9 +104,9 @@ def run_pipeline(
     if show_3ac:
         print("=== CÓDIGO EN TRES DIRECCIONES (3AC) ===")
         gen = CodeGenerator3AC()
-        tac: List[TACInstr] = gen.generate(program)
-        for instr in tac:
-            print(instr)
+        tac: TACProgram = gen.generate(program)
+        if len(tac):
+            print(tac)
         print()
 
 
@@ -119,6 +136,8 @@ def build_argparser() -> argparse.ArgumentParser:
     p.add_argument(
         "--3ac",
         action="store_true",
+        # "3ac" no es un identificador válido como atributo de args
+        dest="three_ac",
         help="Mostrar el código en tres direcciones generado",
     )
     return p
@@ -131,32 +150,16 @@ def main(argv: list[str] | None = None) -> None:
     source = read_source(args.archivo)
 
     # Si no se pasa ninguna bandera, por defecto mostramos AST y 3AC
-    if not (args.tokens or args.ast or args.symtable or args._get_kwargs()):
-        # (fallback por si algo raro pasa con argparse)
+    if not (args.tokens or args.ast or args.symtable or args.three_ac):
         args.ast = True
-        args.symtable = True
-        args._3ac = True
-
-    # Manejo standard: si no hay flags, AST + 3AC
-    if not (args.tokens or args.ast or args.symtable or args.__dict__.get("3ac")):
-        show_tokens = False
-        show_ast = True
-        show_symtable = False
-        show_3ac = True
-    else:
-        show_tokens = args.tokens
-        show_ast = args.ast
-        show_symtable = args.symtable
-        # argparse no permite nombre de arg que empiece por número como atributo,
-        # así que lo obtenemos así:
-        show_3ac = getattr(args, "3ac")
+        args.three_ac = True
 
     run_pipeline(
         source,
-        show_tokens=show_tokens,
-        show_ast=show_ast,
-        show_symtable=show_symtable,
-        show_3ac=show_3ac,
+        show_tokens=args.tokens,
+        show_ast=args.ast,
+        show_symtable=args.symtable,
+        show_3ac=args.three_ac,
     )
 
 
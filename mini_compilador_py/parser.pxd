@@ -0,0 +1,22 @@
+# parser.pxd: declaraciones Cython para parser.py (ver setup.py)
+
+cimport cython
+
+
+@cython.final
+cdef class Parser:
+    cdef object _tokens
+    cdef object _next
+    cdef public object current
+    cdef object _last
+    cdef int _type
+    cdef public object symstack
+    cdef object _scope
+    cdef public dict augassign_ops
+    cdef dict _compound_stmts
+    cdef dict _simple_stmts
+
+    cpdef _advance(self)
+    cpdef object _eat(self, int token_type)
+    cpdef object _peek_token(self)
+    cpdef object _expect_keyword(self, int token_type)
@@ -36,10 +36,14 @@ te permite representar el AST_D y luego generar código en tres direcciones.
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+import gc
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from tokens import (
     Token,
+    TT_NAMES,
+    KEYWORD_TYPES,
+    token_name,
     # tipos básicos
     TT_NAME, TT_NUMBER, TT_STRING,
     TT_NEWLINE, TT_INDENT, TT_DEDENT, TT_ENDMARKER,
@@ -55,6 +59,11 @@ from tokens import (
     TT_PERCENTEQUAL, TT_AMPEREQUAL, TT_PIPEEQUAL,
     TT_CARETEQUAL, TT_LSHIFTEQUAL, TT_RSHIFTEQUAL,
     TT_DOUBLE_STAREQUAL, TT_DOUBLE_SLASHEQUAL,
+    # keywords
+    TT_KW_IF, TT_KW_ELIF, TT_KW_ELSE, TT_KW_WHILE, TT_KW_FOR, TT_KW_IN,
+    TT_KW_DEF, TT_KW_RETURN, TT_KW_PASS, TT_KW_BREAK, TT_KW_CONTINUE,
+    TT_KW_AND, TT_KW_OR, TT_KW_NOT,
+    TT_KW_TRUE, TT_KW_FALSE, TT_KW_NONE,
 )
 
 from astnodes import (
@@ -72,7 +81,6 @@ from astnodes import (
     While,
     For,
     FunctionDef,
-    Arguments,
     Arg,
     Name,
     Num,
@@ -90,30 +98,135 @@ from astnodes import (
     Slice,
 )
 
-from symtable import SymbolTableStack
+from symtable import Kind, SymbolTableStack
+
+
+# True/False/None como átomos: nodos inmutables compartidos por todas sus
+# apariciones, indexados por el tipo de token de la keyword.
+_ATOM_CONST = {
+    TT_KW_TRUE: Bool(True),
+    TT_KW_FALSE: Bool(False),
+    TT_KW_NONE: NoneLiteral(),
+}
+
+# Tipo de keyword -> su texto, para los mensajes de error
+_KEYWORD_TEXT = {tt: word for word, tt in KEYWORD_TYPES.items()}
+
+# Tipo de token de operador -> string del operador en el AST. Es una lista
+# indexada por el tipo (un int pequeño), armada una sola vez al importar;
+# la usan los operadores binarios, unarios y de comparación.
+_OP_STR: List[Optional[str]] = [None] * len(TT_NAMES)
+for _tt, _op in (
+    (TT_PLUS, "+"), (TT_MINUS, "-"), (TT_TILDE, "~"),
+    (TT_STAR, "*"), (TT_SLASH, "/"), (TT_DOUBLE_SLASH, "//"), (TT_PERCENT, "%"),
+    (TT_EQEQUAL, "=="), (TT_NOTEQUAL, "!="),
+    (TT_LESS, "<"), (TT_GREATER, ">"),
+    (TT_LESSEQUAL, "<="), (TT_GREATEREQUAL, ">="),
+):
+    _OP_STR[_tt] = _op
+del _tt, _op
+
+# orelse vacío compartido por todos los if/while/for sin else: una tupla
+# vacía es un singleton, así que no se crea una lista por sentencia.
+_EMPTY_BODY: Tuple[Stmt, ...] = ()
+# Lo mismo para los args/keywords de una llamada que no los tiene
+_NO_ARGS: Tuple[Expr, ...] = ()
+_NO_KEYWORDS: Tuple[KeywordArg, ...] = ()
+
+# Precedencia de los operadores binarios que parsea _parse_binop, indexada
+# por tipo de token (0 = no es operador binario). Mayor número = liga más.
+_PREC_CMP = 1
+_PREC: List[int] = [0] * len(TT_NAMES)
+for _tt in (TT_EQEQUAL, TT_NOTEQUAL, TT_LESS, TT_GREATER, TT_LESSEQUAL, TT_GREATEREQUAL):
+    _PREC[_tt] = _PREC_CMP
+for _tt in (TT_PLUS, TT_MINUS):
+    _PREC[_tt] = 2
+for _tt in (TT_STAR, TT_SLASH, TT_DOUBLE_SLASH, TT_PERCENT):
+    _PREC[_tt] = 3
+
+# Tokens de asignación aumentada como máscara de bits (bit i = tipo i): la
+# pertenencia es un shift y un and, sin recorrer una tupla ni hashear.
+_AUGASSIGN_MASK = 0
+for _tt in (
+    TT_PLUSEQUAL, TT_MINEQUAL, TT_STAREQUAL, TT_SLASHEQUAL,
+    TT_DOUBLE_SLASHEQUAL, TT_PERCENTEQUAL, TT_AMPEREQUAL, TT_PIPEEQUAL,
+    TT_CARETEQUAL, TT_LSHIFTEQUAL, TT_RSHIFTEQUAL, TT_DOUBLE_STAREQUAL,
+):
+    _AUGASSIGN_MASK |= 1 << _tt
+del _tt
+
+# Tokens que forman un átomo por sí solos
+_ATOM_TOKENS = frozenset((
+    TT_NAME, TT_NUMBER, TT_STRING,
+    TT_KW_TRUE, TT_KW_FALSE, TT_KW_NONE,
+))
+
+# Tokens que pueden seguir a una expresión formada por un único átomo:
+# ninguno de ellos continúa un operador ni un trailer (. ( [), así que si
+# el siguiente token es uno de estos, la expresión es solo el átomo.
+_ATOM_END = frozenset((
+    TT_NEWLINE, TT_DEDENT, TT_ENDMARKER,
+    TT_RPAREN, TT_RBRACKET, TT_COMMA, TT_COLON, TT_EQUAL,
+    TT_PLUSEQUAL, TT_MINEQUAL, TT_STAREQUAL, TT_SLASHEQUAL,
+    TT_PERCENTEQUAL, TT_AMPEREQUAL, TT_PIPEEQUAL,
+    TT_CARETEQUAL, TT_LSHIFTEQUAL, TT_RSHIFTEQUAL,
+    TT_DOUBLE_STAREQUAL, TT_DOUBLE_SLASHEQUAL,
+))
+
+
+def _squash_newlines(tokens: Iterable[Token]) -> Iterator[Token]:
+    """
+    Filtra los NEWLINE que no terminan ninguna sentencia: los de líneas en
+    blanco o solo con comentarios (varios NEWLINE seguidos), los del
+    principio del archivo y los que siguen a un INDENT/DEDENT. Así el
+    parser nunca tiene que saltarlos en sus bucles.
+    """
+    prev = TT_NEWLINE
+    for tok in tokens:
+        tt = tok.type
+        if tt == TT_NEWLINE and prev in (TT_NEWLINE, TT_INDENT, TT_DEDENT):
+            continue
+        prev = tt
+        yield tok
 
 
 class ParserError(SyntaxError):
     """Error de sintaxis con información de línea y columna."""
 
     def __init__(self, message: str, token: Token):
-        msg = f"[ParserError] {message} (línea {token.line}, columna {token.column})"
+        line, column = token.position()
+        msg = f"[ParserError] {message} (línea {line}, columna {column})"
         super().__init__(msg)
         self.token = token
 
 
 class Parser:
-    def __init__(self, tokens: List[Token]):
-        if not tokens:
+    def __init__(self, tokens: Iterable[Token]):
+        # Acepta una lista o un iterador (p. ej. Lexer.itokenize()): los
+        # tokens se consumen en orden, guardando a lo sumo uno de más para
+        # mirar hacia adelante (la gramática solo necesita un token de
+        # lookahead) sin materializar toda la secuencia. Los NEWLINE
+        # sobrantes se descartan al vuelo (ver _squash_newlines).
+        self._tokens = _squash_newlines(tokens)
+        self._next: Optional[Token] = None
+
+        current = next(self._tokens, None)
+        if current is None:
             raise ValueError("La lista de tokens no puede estar vacía")
-
-        self.tokens: List[Token] = tokens
-        self.pos: int = 0
-        self.current: Token = self.tokens[self.pos]
+        self.current: Token = current
+        # Tipo del token actual, guardado aparte: casi todas las decisiones
+        # del parser miran solo el tipo, y así cuestan un acceso a atributo
+        # en lugar de dos (self._type).
+        self._type: int = current.type
+        # Último token producido por la fuente (el ENDMARKER al final)
+        self._last: Token = current
 
         # Pila de tablas de símbolos: empezamos con scope global
         self.symstack = SymbolTableStack()
-        self.symstack.push_scope("global")
+        # Scope actual, guardado aparte para no pasar por
+        # symstack.current_scope en cada símbolo; se actualiza junto con
+        # cada push_scope/pop_scope.
+        self._scope = self.symstack.push_scope()
 
         # Mapa de tokens de asignación aumentada a string de operador
         self.augassign_ops = {
@@ -131,42 +244,67 @@ class Parser:
             TT_DOUBLE_STAREQUAL: "**=",
         }
 
+        # Tipo de la keyword inicial -> método que parsea la sentencia. Una
+        # sola búsqueda en el dict en lugar de comparar contra cada keyword.
+        self._compound_stmts = {
+            TT_KW_IF: self.parse_if_stmt,
+            TT_KW_WHILE: self.parse_while_stmt,
+            TT_KW_FOR: self.parse_for_stmt,
+            TT_KW_DEF: self.parse_function_def,
+        }
+        self._simple_stmts = {
+            TT_KW_RETURN: self.parse_return_stmt,
+            TT_KW_PASS: self.parse_pass_stmt,
+            TT_KW_BREAK: self.parse_break_stmt,
+            TT_KW_CONTINUE: self.parse_continue_stmt,
+        }
+
     # ==========================================================
     #  Helpers básicos
     # ==========================================================
 
     def _advance(self) -> None:
-        """Avanza al siguiente token."""
-        if self.pos < len(self.tokens) - 1:
-            self.pos += 1
-            self.current = self.tokens[self.pos]
-
-    def _eat(self, token_type: str) -> Token:
+        """Avanza al siguiente token (al final se queda en el último)."""
+        tok = self._next
+        if tok is not None:
+            self._next = None
+            self.current = tok
+            self._type = tok.type
+            return
+        tok = next(self._tokens, None)
+        if tok is not None:
+            self.current = self._last = tok
+            self._type = tok.type
+
+    def _eat(self, token_type: int) -> Token:
         """Consume un token del tipo esperado o lanza error."""
         tok = self.current
-        if tok.type == token_type:
+        if self._type == token_type:
             self._advance()
             return tok
-        raise ParserError(f"Se esperaba token {token_type}, se encontró {tok.type}", tok)
-
-    def _peek_token(self, k: int = 1) -> Token:
-        """Mira el token k posiciones adelante sin consumirlo."""
-        idx = self.pos + k
-        if idx >= len(self.tokens):
-            return self.tokens[-1]
-        return self.tokens[idx]
-
-    def _is_keyword(self, word: str) -> bool:
-        """Devuelve True si el token actual es NAME con ese lexema."""
-        return self.current.type == TT_NAME and self.current.value == word
-
-    def _expect_keyword(self, word: str) -> Token:
-        """Consume un NAME con el valor `word` o lanza error."""
+        raise ParserError(
+            f"Se esperaba token {token_name(token_type)}, "
+            f"se encontró {token_name(tok.type)}",
+            tok,
+        )
+
+    def _peek_token(self) -> Token:
+        """Mira el token siguiente al actual sin consumirlo."""
+        tok = self._next
+        if tok is None:
+            tok = next(self._tokens, None)
+            if tok is None:
+                return self._last
+            self._next = self._last = tok
+        return tok
+
+    def _expect_keyword(self, token_type: int) -> Token:
+        """Consume la keyword de tipo `token_type` (TT_KW_*) o lanza error."""
         tok = self.current
-        if tok.type == TT_NAME and tok.value == word:
+        if self._type == token_type:
             self._advance()
             return tok
-        raise ParserError(f"Se esperaba keyword '{word}'", tok)
+        raise ParserError(f"Se esperaba keyword '{_KEYWORD_TEXT[token_type]}'", tok)
 
     def _error(self, message: str) -> None:
         raise ParserError(message, self.current)
@@ -178,18 +316,29 @@ class Parser:
     def parse(self) -> Program:
         """
         file: [statements] ENDMARKER
+
+        Durante el parseo se apaga el recolector cíclico: el parser crea
+        ráfagas de nodos (dataclasses con slots) y listas que forman un
+        árbol sin ciclos, así que las pasadas de gc solo recorren objetos
+        vivos sin liberar nada. Los nodos se liberan juntos, por conteo de
+        referencias, cuando se suelta el Program.
         """
         body: List[Stmt] = []
 
-        while self.current.type != TT_ENDMARKER:
-            # saltar NEWLINE sueltos
-            if self.current.type == TT_NEWLINE:
-                self._advance()
-                continue
-            if self.current.type in (TT_INDENT, TT_DEDENT):
-                self._error("INDENT/DEDENT inesperado al nivel superior")
-            stmt = self.parse_statement()
-            body.append(stmt)
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            while True:
+                tt = self._type
+                if tt == TT_ENDMARKER:
+                    break
+                if tt in (TT_INDENT, TT_DEDENT):
+                    self._error("INDENT/DEDENT inesperado al nivel superior")
+                stmt = self.parse_statement()
+                body.append(stmt)
+        finally:
+            if gc_enabled:
+                gc.enable()
 
         return Program(body=body)
 
@@ -201,14 +350,9 @@ class Parser:
         """
         statement: compound_stmt | simple_stmt
         """
-        if self._is_keyword("if"):
-            return self.parse_if_stmt()
-        if self._is_keyword("while"):
-            return self.parse_while_stmt()
-        if self._is_keyword("for"):
-            return self.parse_for_stmt()
-        if self._is_keyword("def"):
-            return self.parse_function_def()
+        handler = self._compound_stmts.get(self._type)
+        if handler is not None:
+            return handler()
 
         # resto: simple_stmt
         return self.parse_simple_stmt()
@@ -227,22 +371,17 @@ class Parser:
             - continue_stmt
         y debe terminar con NEWLINE (o al final del bloque/archivo).
         """
-        if self._is_keyword("return"):
-            node = self.parse_return_stmt()
-        elif self._is_keyword("pass"):
-            node = self.parse_pass_stmt()
-        elif self._is_keyword("break"):
-            node = self.parse_break_stmt()
-        elif self._is_keyword("continue"):
-            node = self.parse_continue_stmt()
+        handler = self._simple_stmts.get(self._type)
+        if handler is not None:
+            node = handler()
         else:
             node = self.parse_expr_or_assignment()
 
         # Consumir NEWLINE si está; si estamos justo antes de DEDENT/ENDMARKER
         # también lo aceptamos, para ser un poco tolerantes.
-        if self.current.type == TT_NEWLINE:
+        if self._type == TT_NEWLINE:
             self._advance()
-        elif self.current.type in (TT_DEDENT, TT_ENDMARKER):
+        elif self._type in (TT_DEDENT, TT_ENDMARKER):
             # permitido: final de bloque / archivo
             pass
         else:
@@ -254,23 +393,23 @@ class Parser:
         """
         return_stmt: 'return' [expression]
         """
-        self._expect_keyword("return")
+        self._expect_keyword(TT_KW_RETURN)
         # Puede no tener expresión
-        if self.current.type in (TT_NEWLINE, TT_DEDENT, TT_ENDMARKER):
+        if self._type in (TT_NEWLINE, TT_DEDENT, TT_ENDMARKER):
             return Return(value=None)
         value = self.parse_expression()
         return Return(value=value)
 
     def parse_pass_stmt(self) -> Pass:
-        self._expect_keyword("pass")
+        self._expect_keyword(TT_KW_PASS)
         return Pass()
 
     def parse_break_stmt(self) -> Break:
-        self._expect_keyword("break")
+        self._expect_keyword(TT_KW_BREAK)
         return Break()
 
     def parse_continue_stmt(self) -> Continue:
-        self._expect_keyword("continue")
+        self._expect_keyword(TT_KW_CONTINUE)
         return Continue()
 
     def parse_expr_or_assignment(self) -> Stmt:
@@ -292,14 +431,12 @@ class Parser:
 
             # Registrar símbolo de variable en el scope actual (si no existe localmente)
             if isinstance(target, Name):
-                scope = self.symstack.current_scope
-                if scope.lookup_local(target.id) is None:
-                    scope.define(target.id, kind="variable", typ="unknown")
+                self._scope.declare(target.id, kind=Kind.VARIABLE, typ="unknown")
 
             return Assign(targets=[target], value=value)
 
         # Asignación aumentada: a += expr, etc.
-        if tok.type in self.augassign_ops:
+        if (1 << tok.type) & _AUGASSIGN_MASK:
             op_str = self.augassign_ops[tok.type]
             target = self._ensure_assignable(left_expr)
             self._advance()  # consume op=
@@ -329,30 +466,36 @@ class Parser:
                 [elif expr: suite]*
                 [else: suite]
         """
-        self._expect_keyword("if")
+        self._expect_keyword(TT_KW_IF)
         test = self.parse_expression()
         self._eat(TT_COLON)
         body = self.parse_block()
 
         # elif / else
-        orelse: List[Stmt] = []
-        current_orelse = orelse
+        orelse: Sequence[Stmt] = _EMPTY_BODY
+        last_if: Optional[If] = None  # último elif encadenado
 
         # Encadenar elif como If dentro de orelse, estilo Python
-        while self._is_keyword("elif"):
+        while self._type == TT_KW_ELIF:
             self._advance()
             elif_test = self.parse_expression()
             self._eat(TT_COLON)
             elif_body = self.parse_block()
-            new_if = If(test=elif_test, body=elif_body, orelse=[])
-            current_orelse.append(new_if)
-            current_orelse = new_if.orelse
+            new_if = If(test=elif_test, body=elif_body)
+            if last_if is None:
+                orelse = [new_if]
+            else:
+                last_if.orelse = [new_if]
+            last_if = new_if
 
-        if self._is_keyword("else"):
+        if self._type == TT_KW_ELSE:
             self._advance()
             self._eat(TT_COLON)
             else_body = self.parse_block()
-            current_orelse.extend(else_body)
+            if last_if is None:
+                orelse = else_body
+            else:
+                last_if.orelse = else_body
 
         return If(test=test, body=body, orelse=orelse)
 
@@ -362,13 +505,13 @@ class Parser:
             while expr: suite
                 [else: suite]
         """
-        self._expect_keyword("while")
+        self._expect_keyword(TT_KW_WHILE)
         test = self.parse_expression()
         self._eat(TT_COLON)
         body = self.parse_block()
 
-        orelse: List[Stmt] = []
-        if self._is_keyword("else"):
+        orelse: Sequence[Stmt] = _EMPTY_BODY
+        if self._type == TT_KW_ELSE:
             self._advance()
             self._eat(TT_COLON)
             orelse = self.parse_block()
@@ -381,15 +524,15 @@ class Parser:
             for target in expr: suite
                 [else: suite]
         """
-        self._expect_keyword("for")
+        self._expect_keyword(TT_KW_FOR)
         target_expr = self.parse_expression()
-        self._expect_keyword("in")
+        self._expect_keyword(TT_KW_IN)
         iter_expr = self.parse_expression()
         self._eat(TT_COLON)
         body = self.parse_block()
 
-        orelse: List[Stmt] = []
-        if self._is_keyword("else"):
+        orelse: Sequence[Stmt] = _EMPTY_BODY
+        if self._type == TT_KW_ELSE:
             self._advance()
             self._eat(TT_COLON)
             orelse = self.parse_block()
@@ -401,14 +544,12 @@ class Parser:
         function_def (forma reducida, sin async, sin decoradores, sin anotaciones):
             def NAME '(' [param_list] ')' ':' suite
         """
-        self._expect_keyword("def")
+        self._expect_keyword(TT_KW_DEF)
         name_tok = self._eat(TT_NAME)
         func_name = name_tok.value
 
         # Registrar símbolo de función en scope actual
-        scope = self.symstack.current_scope
-        if scope.lookup_local(func_name) is None:
-            scope.define(func_name, kind="function", typ="function")
+        self._scope.declare(func_name, kind=Kind.FUNCTION, typ="function")
 
         self._eat(TT_LPAREN)
         params = self.parse_parameters()
@@ -416,20 +557,20 @@ class Parser:
         self._eat(TT_COLON)
 
         # Nuevo scope para la función
-        func_scope_name = f"func {func_name}"
-        self.symstack.push_scope(func_scope_name)
+        outer_scope = self._scope
+        func_scope = self._scope = self.symstack.push_function_scope(func_name)
 
         # Registrar parámetros como símbolos dentro del scope de la función
         for arg in params:
-            self.symstack.define(arg.name, kind="param", typ="unknown")
+            func_scope.define(arg.name, kind=Kind.PARAM, typ="unknown")
 
         body = self.parse_block()
 
         # Cerrar scope de la función
         self.symstack.pop_scope()
+        self._scope = outer_scope
 
-        args_node = Arguments(args=params)
-        return FunctionDef(name=func_name, args=args_node, body=body, returns=None, decorators=[])
+        return FunctionDef(name=func_name, args=params, body=body, returns=None, decorators=[])
 
     def parse_parameters(self) -> List[Arg]:
         """
@@ -438,19 +579,19 @@ class Parser:
         """
         params: List[Arg] = []
 
-        if self.current.type == TT_RPAREN:
+        if self._type == TT_RPAREN:
             return params  # sin parámetros
 
         while True:
-            if self.current.type != TT_NAME:
+            if self._type != TT_NAME:
                 self._error("Se esperaba nombre de parámetro")
             name_tok = self._eat(TT_NAME)
             params.append(Arg(name=name_tok.value))
 
-            if self.current.type == TT_COMMA:
+            if self._type == TT_COMMA:
                 # posible coma final
                 next_tok = self._peek_token()
-                self._eat(TT_COMMA)
+                self._advance()  # ','
                 if next_tok.type == TT_RPAREN:
                     break
                 continue
@@ -471,14 +612,11 @@ class Parser:
             simple_stmt (en la misma línea que ':')
         """
         # Forma en bloque (lo habitual en tu proyecto)
-        if self.current.type == TT_NEWLINE:
+        if self._type == TT_NEWLINE:
             self._eat(TT_NEWLINE)
             self._eat(TT_INDENT)
             stmts: List[Stmt] = []
-            while self.current.type not in (TT_DEDENT, TT_ENDMARKER):
-                if self.current.type == TT_NEWLINE:
-                    self._advance()
-                    continue
+            while self._type not in (TT_DEDENT, TT_ENDMARKER):
                 stmts.append(self.parse_statement())
             self._eat(TT_DEDENT)
             return stmts
@@ -496,7 +634,14 @@ class Parser:
         """
         expression (subconjunto):
             or_test
+
+        Atajo: si la expresión es un solo átomo (NAME, NUMBER, STRING,
+        True/False/None) seguido de un token de _ATOM_END (x = 1, f(a, b), return x...) se parsea el átomo
+        directamente, sin bajar por todos los niveles de precedencia que
+        lo devolverían tal cual.
         """
+        if self._type in _ATOM_TOKENS and self._peek_token().type in _ATOM_END:
+            return self.parse_atom()
         return self.parse_or()
 
     def parse_or(self) -> Expr:
@@ -505,14 +650,16 @@ class Parser:
             conjunction ('or' conjunction)*
         """
         node = self.parse_and()
+        values: Optional[List[Expr]] = None
 
-        while self._is_keyword("or"):
+        while self._type == TT_KW_OR:
             self._advance()
             right = self.parse_and()
-            if isinstance(node, BoolOp) and node.op == "or":
-                node.values.append(right)
+            if values is None:
+                values = [node, right]
+                node = BoolOp(op="or", values=values)
             else:
-                node = BoolOp(op="or", values=[node, right])
+                values.append(right)
 
         return node
 
@@ -522,14 +669,16 @@ class Parser:
             inversion ('and' inversion)*
         """
         node = self.parse_not()
+        values: Optional[List[Expr]] = None
 
-        while self._is_keyword("and"):
+        while self._type == TT_KW_AND:
             self._advance()
             right = self.parse_not()
-            if isinstance(node, BoolOp) and node.op == "and":
-                node.values.append(right)
+            if values is None:
+                values = [node, right]
+                node = BoolOp(op="and", values=values)
             else:
-                node = BoolOp(op="and", values=[node, right])
+                values.append(right)
 
         return node
 
@@ -538,87 +687,63 @@ class Parser:
         inversion:
             'not' inversion
             | comparison
-        """
-        if self._is_keyword("not"):
-            tok = self.current
-            self._advance()
-            operand = self.parse_not()
-            return UnaryOp(op="not", operand=operand)
-        return self.parse_comparison()
 
-    def parse_comparison(self) -> Expr:
+        Los 'not' encadenados se cuentan en un bucle y se envuelven al
+        final, sin una llamada recursiva por cada uno.
         """
-        comparison (subconjunto):
-            arith_expr (comp_op arith_expr)*
-        comp_op: '==', '!=', '<', '>', '<=', '>='
-        """
-        node = self.parse_arith_expr()
-        ops: List[str] = []
-        comparators: List[Expr] = []
-
-        while self.current.type in (
-            TT_EQEQUAL, TT_NOTEQUAL,
-            TT_LESS, TT_GREATER,
-            TT_LESSEQUAL, TT_GREATEREQUAL,
-        ):
-            op_tok = self.current
+        count = 0
+        while self._type == TT_KW_NOT:
             self._advance()
-            op_str = self._map_compare_op(op_tok.type)
-            right = self.parse_arith_expr()
-            ops.append(op_str)
-            comparators.append(right)
-
-        if ops:
-            return Compare(left=node, ops=ops, comparators=comparators)
+            count += 1
+        node = self.parse_comparison()
+        for _ in range(count):
+            node = UnaryOp(op="not", operand=node)
         return node
 
-    def _map_compare_op(self, token_type: str) -> str:
-        mapping = {
-            TT_EQEQUAL: "==",
-            TT_NOTEQUAL: "!=",
-            TT_LESS: "<",
-            TT_GREATER: ">",
-            TT_LESSEQUAL: "<=",
-            TT_GREATEREQUAL: ">=",
-        }
-        return mapping[token_type]
-
-    def parse_arith_expr(self) -> Expr:
+    def parse_comparison(self) -> Expr:
         """
+        comparison (subconjunto):
+            sum (comp_op sum)*
         sum:
             term (('+' | '-') term)*
-        """
-        node = self.parse_term()
-
-        while self.current.type in (TT_PLUS, TT_MINUS):
-            op_tok = self.current
-            self._advance()
-            op_str = "+" if op_tok.type == TT_PLUS else "-"
-            right = self.parse_term()
-            node = BinOp(left=node, op=op_str, right=right)
+        term:
+            factor (('*' | '/' | '//' | '%') factor)*
+        comp_op: '==', '!=', '<', '>', '<=', '>='
 
-        return node
+        Los tres niveles se parsean juntos con precedence climbing (ver
+        _parse_binop) en lugar de un método por nivel.
+        """
+        return self._parse_binop(_PREC_CMP)
 
-    def parse_term(self) -> Expr:
+    def _parse_binop(self, min_prec: int) -> Expr:
         """
-        term:
-            factor (('*' | '/' | '//' | '%') factor)*
+        Precedence climbing sobre los operadores binarios de _PREC: consume
+        operadores con precedencia >= min_prec y parsea el operando derecho
+        con precedencia estrictamente mayor (asociatividad a izquierda).
+
+        Las comparaciones no se anidan: una cadena a < b <= c se junta en un
+        único Compare, como en Python.
         """
         node = self.parse_factor()
 
-        while self.current.type in (TT_STAR, TT_SLASH, TT_DOUBLE_SLASH, TT_PERCENT):
-            op_tok = self.current
-            self._advance()
-            if op_tok.type == TT_STAR:
-                op_str = "*"
-            elif op_tok.type == TT_SLASH:
-                op_str = "/"
-            elif op_tok.type == TT_DOUBLE_SLASH:
-                op_str = "//"
+        prec = _PREC[self._type]
+        while prec >= min_prec:
+            if prec == _PREC_CMP:
+                ops: List[str] = []
+                comparators: List[Expr] = []
+                tt = self._type
+                while _PREC[tt] == _PREC_CMP:
+                    self._advance()
+                    ops.append(_OP_STR[tt])
+                    comparators.append(self._parse_binop(_PREC_CMP + 1))
+                    tt = self._type
+                node = Compare(left=node, ops=ops, comparators=comparators)
             else:
-                op_str = "%"
-            right = self.parse_factor()
-            node = BinOp(left=node, op=op_str, right=right)
+                tt = self._type
+                self._advance()
+                right = self._parse_binop(prec + 1)
+                node = BinOp(left=node, op=_OP_STR[tt], right=right)
+            prec = _PREC[self._type]
 
         return node
 
@@ -627,18 +752,23 @@ class Parser:
         factor:
             ('+' | '-' | '~') factor
             | power
+
+        Los prefijos unarios se juntan en un bucle y se aplican después en
+        orden inverso (el más cercano al operando queda más adentro).
         """
-        if self.current.type in (TT_PLUS, TT_MINUS, TT_TILDE):
-            op_tok = self.current
+        tt = self._type
+        if tt not in (TT_PLUS, TT_MINUS, TT_TILDE):
+            return self.parse_power()
+
+        ops: List[str] = []
+        while tt in (TT_PLUS, TT_MINUS, TT_TILDE):
+            ops.append(_OP_STR[tt])
             self._advance()
-            op_str = {
-                TT_PLUS: "+",
-                TT_MINUS: "-",
-                TT_TILDE: "~",
-            }[op_tok.type]
-            operand = self.parse_factor()
-            return UnaryOp(op=op_str, operand=operand)
-        return self.parse_power()
+            tt = self._type
+        node = self.parse_power()
+        for op_str in reversed(ops):
+            node = UnaryOp(op=op_str, operand=node)
+        return node
 
     def parse_power(self) -> Expr:
         """
@@ -647,7 +777,7 @@ class Parser:
         """
         node = self.parse_primary()
 
-        if self.current.type == TT_DOUBLE_STAR:
+        if self._type == TT_DOUBLE_STAR:
             self._advance()
             right = self.parse_factor()
             node = BinOp(left=node, op="**", right=right)
@@ -662,14 +792,15 @@ class Parser:
         node = self.parse_atom()
 
         while True:
-            if self.current.type == TT_DOT:
+            tt = self._type
+            if tt == TT_DOT:
                 # atributo: obj.attr
                 self._advance()
                 name_tok = self._eat(TT_NAME)
                 node = Attribute(value=node, attr=name_tok.value)
                 continue
 
-            if self.current.type == TT_LPAREN:
+            if tt == TT_LPAREN:
                 # llamada: func(args...)
                 self._advance()
                 args, keywords = self.parse_arglist()
@@ -677,7 +808,7 @@ class Parser:
                 node = Call(func=node, args=args, keywords=keywords)
                 continue
 
-            if self.current.type == TT_LBRACKET:
+            if tt == TT_LBRACKET:
                 # subíndice: obj[expr]
                 self._advance()
                 # Para simplificar, solo soportamos un índice simple,
@@ -692,41 +823,49 @@ class Parser:
 
         return node
 
-    def parse_arglist(self) -> Tuple[List[Expr], List[KeywordArg]]:
+    def parse_arglist(self) -> Tuple[Sequence[Expr], Sequence[KeywordArg]]:
         """
         arglist reducida:
             (positional | keyword) (',' (positional | keyword))* [',']
         keyword: NAME '=' expression
-        """
-        args: List[Expr] = []
-        keywords: List[KeywordArg] = []
 
+        La lista de keywords se crea recién con el primer kwarg (la
+        mayoría de las llamadas no tiene); si no hay, se devuelve la tupla
+        vacía compartida. Igual para los args de una llamada sin argumentos.
+        """
         # Sin argumentos
-        if self.current.type == TT_RPAREN:
-            return args, keywords
+        if self._type == TT_RPAREN:
+            return _NO_ARGS, _NO_KEYWORDS
+
+        args: List[Expr] = []
+        keywords: Optional[List[KeywordArg]] = None
 
         while True:
-            # keyword si: NAME '='
-            if self.current.type == TT_NAME and self._peek_token().type == TT_EQUAL:
-                name_tok = self._eat(TT_NAME)
-                self._eat(TT_EQUAL)
+            # keyword si: NAME '='. Con los dos tipos ya comprobados se
+            # consumen con _advance, sin que _eat los vuelva a verificar.
+            name_tok = self.current
+            if self._type == TT_NAME and self._peek_token().type == TT_EQUAL:
+                self._advance()  # NAME
+                self._advance()  # '='
                 value = self.parse_expression()
+                if keywords is None:
+                    keywords = []
                 keywords.append(KeywordArg(name=name_tok.value, value=value))
             else:
                 # posicional
                 expr = self.parse_expression()
                 args.append(expr)
 
-            if self.current.type == TT_COMMA:
+            if self._type == TT_COMMA:
                 # podría haber coma final
                 next_tok = self._peek_token()
-                self._eat(TT_COMMA)
+                self._advance()  # ','
                 if next_tok.type == TT_RPAREN:
                     break
                 continue
             break
 
-        return args, keywords
+        return args, (keywords if keywords is not None else _NO_KEYWORDS)
 
     def parse_atom(self) -> Expr:
         """
@@ -738,12 +877,6 @@ class Parser:
 
         if tok.type == TT_NAME:
             self._advance()
-            if tok.value == "True":
-                return Bool(True)
-            if tok.value == "False":
-                return Bool(False)
-            if tok.value == "None":
-                return NoneLiteral()
             return Name(id=tok.value)
 
         if tok.type == TT_NUMBER:
@@ -760,6 +893,11 @@ class Parser:
             self._eat(TT_RPAREN)
             return expr
 
+        const = _ATOM_CONST.get(tok.type)
+        if const is not None:
+            self._advance()
+            return const
+
         self._error("Se esperaba NAME, NUMBER, STRING o '(' expresión ')'")
 
 
@@ -767,7 +905,7 @@ class Parser:
 #  Helper para uso directo
 # ==========================================================
 
-def parse_tokens(tokens: List[Token]) -> Program:
+def parse_tokens(tokens: Iterable[Token]) -> Program:
     """
     Helper rápido:
         from lexer import Lexer
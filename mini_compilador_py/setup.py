@@ -0,0 +1,45 @@
+# setup.py
+"""
+Compilación opcional con Cython de los módulos más usados del compilador.
+
+Los archivos .py siguen funcionando tal cual con el intérprete; este script
+solo genera extensiones nativas (.so) que Python carga en su lugar cuando
+están presentes junto a los .py:
+
+    python3 setup.py build_ext --inplace
+
+Si Cython no está instalado, o el intérprete no es CPython, no se compila
+nada y el compilador sigue ejecutándose en Python puro.
+"""
+
+import platform
+import sys
+
+from setuptools import setup
+
+# Módulos que se compilan en modo "pure Python" (tipos en .pxd / anotaciones)
+CYTHON_MODULES = [
+    "codegen3ac.py",
+    "lexer.py",
+    "parser.py",
+    "tokens.py",
+]
+
+
+def build_ext_modules():
+    if platform.python_implementation() != "CPython":
+        return []
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        print("Cython no está instalado: se usarán los módulos .py", file=sys.stderr)
+        return []
+    return cythonize(CYTHON_MODULES, language_level=3)
+
+
+setup(
+    name="mini_compilador_py",
+    # Solo construimos extensiones; los .py se usan directamente desde aquí.
+    py_modules=[],
+    ext_modules=build_ext_modules(),
+)
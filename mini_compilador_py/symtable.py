@@ -26,34 +26,98 @@ como "int", "float", "str", "bool", "function", etc.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional, List
+from enum import IntEnum
+from typing import Callable, Dict, Optional, List, Tuple, Union
+
+
+# ==========================================================
+#  TIPOS DE SCOPE
+# ==========================================================
+
+# El tipo de scope es un entero pequeño (comparación directa, sin mirar
+# el texto); el nombre legible ("func foo") solo se arma si se pide.
+SCOPE_GLOBAL = 0
+SCOPE_FUNCTION = 1
+SCOPE_CLASS = 2
+SCOPE_BLOCK = 3
+
+
+def _parse_scope_name(scope_name: str) -> Tuple[int, Optional[str]]:
+    """
+    Compatibilidad con la forma anterior, donde el scope se identificaba
+    con un string: 'global' -> (SCOPE_GLOBAL, None), 'func foo' ->
+    (SCOPE_FUNCTION, 'foo'), 'class C' -> (SCOPE_CLASS, 'C'); cualquier
+    otro texto es un bloque con ese nombre.
+    """
+    if scope_name == "global":
+        return SCOPE_GLOBAL, None
+    prefix, _, name = scope_name.partition(" ")
+    if name:
+        if prefix == "func":
+            return SCOPE_FUNCTION, name
+        if prefix == "class":
+            return SCOPE_CLASS, name
+    return SCOPE_BLOCK, scope_name
+
+
+# ==========================================================
+#  CLASES DE SÍMBOLO
+# ==========================================================
+
+class Kind(IntEnum):
+    """
+    Clase de símbolo. Se guarda como entero en cada entrada: comparar
+    entry.kind == Kind.FUNCTION es una comparación de ints, no de strings.
+    """
+    VARIABLE = 0
+    FUNCTION = 1
+    CLASS = 2
+    PARAM = 3
+    IMPORT = 4
+
+
+# Nombre en minúsculas de cada Kind, indexado por su valor ('variable',
+# 'function', ...): es lo que muestran el repr de las entradas y --symtable
+_KIND_NAMES = tuple(member.name.lower() for member in Kind)
+
+
+def _as_kind(kind: Union[int, str]) -> int:
+    """
+    Acepta la clase de símbolo como Kind (lo normal) o, por compatibilidad,
+    como string ('variable', 'param', ...).
+    """
+    if isinstance(kind, str):
+        return Kind[kind.upper()]
+    return kind
 
 
 # ==========================================================
 #  CLASES BÁSICAS
 # ==========================================================
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class SymbolEntry:
     """
-    Entrada de símbolo en la tabla:
+    Entrada de símbolo en la tabla (con slots: sin __dict__ por entrada,
+    igual que los nodos del AST; eq=False porque las entradas se comparan
+    por identidad).
 
     Atributos:
         name        : nombre del identificador
-        kind        : clase de símbolo (por ejemplo: 'variable', 'function', 'param')
+        kind        : clase de símbolo (Kind.VARIABLE, Kind.FUNCTION, Kind.PARAM, ...)
         typ         : tipo del símbolo (string simple: 'int', 'float', 'str', etc.)
         scope_name  : nombre del scope lógico al que pertenece (p. ej. 'global', nombre de función)
         offset      : posición relativa (opcional) para uso posterior en generación de código
     """
     name: str
-    kind: str
+    kind: int
     typ: str
     scope_name: str
     offset: Optional[int] = None
 
     def __repr__(self) -> str:
         return (
-            f"SymbolEntry(name={self.name!r}, kind={self.kind!r}, "
+            f"SymbolEntry(name={self.name!r}, kind={_KIND_NAMES[self.kind]!r}, "
             f"type={self.typ!r}, scope={self.scope_name!r}, offset={self.offset!r})"
         )
 
@@ -68,16 +132,58 @@ class SymbolTable:
                     └── sub-scope (if, while, etc.) (padre=foo)
     """
 
-    def __init__(self, scope_name: str = "global", parent: Optional["SymbolTable"] = None):
-        self.scope_name: str = scope_name
+    def __init__(
+        self,
+        scope_kind: Union[int, str] = SCOPE_GLOBAL,
+        parent: Optional["SymbolTable"] = None,
+        *,
+        name: Optional[str] = None,
+        scope_name: Optional[str] = None,
+    ):
+        # Forma anterior: SymbolTable("func foo", padre) o
+        # SymbolTable(scope_name="func foo"). El string ya trae el nombre,
+        # así que no se puede combinar con name.
+        if scope_name is not None:
+            if scope_kind != SCOPE_GLOBAL:
+                raise TypeError("SymbolTable: scope_kind y scope_name son excluyentes")
+            scope_kind = scope_name
+        if isinstance(scope_kind, str):
+            if name is not None:
+                raise TypeError("SymbolTable: un scope_kind string ya incluye el nombre; no pases name")
+            scope_kind, name = _parse_scope_name(scope_kind)
+        self.scope_kind: int = scope_kind
+        self.name: Optional[str] = name
         self.parent: Optional["SymbolTable"] = parent
         self.entries: Dict[str, SymbolEntry] = {}
+        # Nombre legible del scope, armado la primera vez que se pide
+        self._scope_name: Optional[str] = None
+
+    @property
+    def scope_name(self) -> str:
+        """
+        Nombre legible del scope ('global', 'func foo', ...), para
+        diagnósticos y volcados. Se calcula una vez y queda guardado.
+        """
+        scope_name = self._scope_name
+        if scope_name is None:
+            kind = self.scope_kind
+            name = self.name
+            if kind == SCOPE_FUNCTION:
+                scope_name = f"func {name}"
+            elif kind == SCOPE_CLASS:
+                scope_name = f"class {name}"
+            elif kind == SCOPE_GLOBAL:
+                scope_name = name or "global"
+            else:
+                scope_name = name or "block"
+            self._scope_name = scope_name
+        return scope_name
 
     # -------------------------
     #  Operaciones básicas
     # -------------------------
 
-    def define(self, name: str, kind: str = "variable", typ: str = "unknown") -> SymbolEntry:
+    def define(self, name: str, kind: Union[int, str] = Kind.VARIABLE, typ: str = "unknown") -> SymbolEntry:
         """
         Crea una nueva entrada en el scope actual.
 
@@ -91,13 +197,32 @@ class SymbolTable:
 
         entry = SymbolEntry(
             name=name,
-            kind=kind,
+            kind=_as_kind(kind),
             typ=typ,
             scope_name=self.scope_name,
         )
         self.entries[name] = entry
         return entry
 
+    def declare(self, name: str, kind: Union[int, str] = Kind.VARIABLE, typ: str = "unknown") -> SymbolEntry:
+        """
+        Devuelve la entrada de `name` en este scope, creándola si no existe.
+
+        Equivale a "lookup_local y, si no está, define", pero con una sola
+        búsqueda en el diccionario: es el caso de cada asignación, donde lo
+        normal es que el nombre ya esté registrado.
+        """
+        entries = self.entries
+        entry = entries.get(name)
+        if entry is None:
+            entry = entries[name] = SymbolEntry(
+                name=name,
+                kind=_as_kind(kind),
+                typ=typ,
+                scope_name=self.scope_name,
+            )
+        return entry
+
     def lookup_local(self, name: str) -> Optional[SymbolEntry]:
         """
         Busca un símbolo SOLO en el scope actual.
@@ -106,14 +231,17 @@ class SymbolTable:
 
     def lookup(self, name: str) -> Optional[SymbolEntry]:
         """
-        Busca un símbolo en este scope y, si no está,
-        recorre recursivamente los scopes padres.
+        Busca un símbolo en este scope y, si no está, en los scopes
+        padres. La cadena se recorre con un bucle, consultando el
+        diccionario de cada scope directamente (sin una llamada a método
+        por nivel).
         """
-        entry = self.lookup_local(name)
-        if entry is not None:
-            return entry
-        if self.parent is not None:
-            return self.parent.lookup(name)
+        table: Optional[SymbolTable] = self
+        while table is not None:
+            entry = table.entries.get(name)
+            if entry is not None:
+                return entry
+            table = table.parent
         return None
 
     def __repr__(self) -> str:
@@ -132,63 +260,100 @@ class SymbolTableStack:
     Helper para manejar scopes como una pila:
 
         stack = SymbolTableStack()
-        stack.push_scope("global")
+        stack.push_scope()                  # global
         ...
-        stack.push_scope("func foo")
+        stack.push_function_scope("foo")    # "func foo"
         ...
         stack.pop_scope()
+
+    stack.define(...) define en el scope actual: es un atributo que
+    push_scope/pop_scope apuntan al método define ligado de la cima, así
+    cada llamada va directo a SymbolTable.define. Con la pila vacía apunta
+    a _define_no_scope, que lanza error.
     """
 
+    # Sin __dict__ por instancia; "define" es el atributo descrito arriba
+    __slots__ = ("stack", "_gets", "_top", "define")
+
     def __init__(self):
         self.stack: List[SymbolTable] = []
+        # entries.get de cada scope de la pila, en el mismo orden: lookup
+        # los recorre sin cargar table.entries en cada nivel
+        self._gets: List[Callable[[str], Optional[SymbolEntry]]] = []
+        # Cima de la pila (None si está vacía), actualizada en cada
+        # push/pop para no indexar self.stack[-1] en cada consulta
+        self._top: Optional[SymbolTable] = None
+        self.define: Callable[..., SymbolEntry] = self._define_no_scope
 
     # -------------------------
     #  Gestión de la pila
     # -------------------------
 
-    def push_scope(self, scope_name: str) -> SymbolTable:
+    def push_scope(self, scope_kind: Union[int, str] = SCOPE_GLOBAL, name: Optional[str] = None) -> SymbolTable:
         """
         Crea un nuevo scope (SymbolTable) como hijo del scope actual
         y lo pone en la cima de la pila. Si la pila está vacía, el padre
         es None (scope raíz).
+
+        scope_kind también puede ser el nombre del scope como string
+        ('global', 'func foo', ...), como en la versión anterior.
         """
-        parent = self.stack[-1] if self.stack else None
-        table = SymbolTable(scope_name=scope_name, parent=parent)
+        table = SymbolTable(scope_kind, self._top, name=name)
         self.stack.append(table)
+        self._gets.append(table.entries.get)
+        self._top = table
+        self.define = table.define
         return table
 
+    def push_function_scope(self, func_name: str) -> SymbolTable:
+        """
+        Atajo para push_scope(SCOPE_FUNCTION, func_name).
+        """
+        return self.push_scope(SCOPE_FUNCTION, func_name)
+
     def pop_scope(self) -> SymbolTable:
         """
         Saca el scope actual de la pila y lo devuelve.
         """
         if not self.stack:
             raise RuntimeError("Intento de pop_scope() con pila de scopes vacía")
-        return self.stack.pop()
+        table = self.stack.pop()
+        self._gets.pop()
+        top = self._top = table.parent
+        self.define = top.define if top is not None else self._define_no_scope
+        return table
 
     @property
     def current_scope(self) -> SymbolTable:
         """
         Devuelve el scope actual (cima de la pila).
         """
-        if not self.stack:
+        top = self._top
+        if top is None:
             raise RuntimeError("No hay scope actual: la pila está vacía")
-        return self.stack[-1]
+        return top
 
     # -------------------------
     #  Atajos sobre el scope actual
     # -------------------------
 
-    def define(self, name: str, kind: str = "variable", typ: str = "unknown") -> SymbolEntry:
+    def _define_no_scope(self, name: str, kind: Union[int, str] = Kind.VARIABLE, typ: str = "unknown") -> SymbolEntry:
         """
-        Define un símbolo en el scope actual.
+        Valor de self.define mientras la pila está vacía.
         """
-        return self.current_scope.define(name, kind=kind, typ=typ)
+        raise RuntimeError("No hay scope actual: la pila está vacía")
 
     def lookup(self, name: str) -> Optional[SymbolEntry]:
         """
         Busca un símbolo a partir del scope actual hacia los padres.
         """
-        return self.current_scope.lookup(name)
+        if self._top is None:
+            raise RuntimeError("No hay scope actual: la pila está vacía")
+        for get in reversed(self._gets):
+            entry = get(name)
+            if entry is not None:
+                return entry
+        return None
 
     def __repr__(self) -> str:
         return "SymbolTableStack(" + " -> ".join(
@@ -0,0 +1,3 @@
+# tokens.pxd: declaraciones Cython para tokens.py (ver setup.py)
+
+cpdef tuple offset_to_position(object line_starts, Py_ssize_t offset)
@@ -9,90 +9,138 @@ La idea es:
     * type  -> clase general del token (NAME, NUMBER, STRING, NEWLINE, etc.)
     * value -> lexema o valor semántico (por ejemplo, 123.4, "if", "a")
     * line / column -> posición para mensajes de error
-- Las palabras reservadas de Python se representan con type=NAME
-  y value="if", "def", "class", etc. El parser verificará el value
-  cuando necesite un keyword específico.
+- Las palabras reservadas que entiende el parser (if, while, def, and,
+  True...) tienen su propio tipo TT_KW_*, asignado por el lexer: el parser
+  las reconoce comparando solo el tipo. El resto de las keywords de
+  Python se representan con type=NAME y value="class", "import", etc.
 """
 
-from dataclasses import dataclass
-from typing import Any, Set
+import sys
+from bisect import bisect_left
+from enum import IntEnum
+from typing import Any, Dict, FrozenSet, NamedTuple, Sequence, Tuple
 
 
 # =========================
 #  TIPOS BÁSICOS DE TOKEN
 # =========================
+# Los tipos son enteros pequeños y no strings: el parser compara tipos en
+# cada paso y comparar dos int es más barato que comparar dos str.
+# TT_NAMES (más abajo) guarda el nombre legible de cada uno para los
+# mensajes de error y la salida --tokens.
 
 # Tokens de alto nivel / estructurales
-TT_NAME        = "NAME"
-TT_NUMBER      = "NUMBER"
-TT_STRING      = "STRING"
+TT_NAME        = 1
+TT_NUMBER      = 2
+TT_STRING      = 3
 
-TT_NEWLINE     = "NEWLINE"
-TT_INDENT      = "INDENT"
-TT_DEDENT      = "DEDENT"
-TT_TYPE_COMMENT = "TYPE_COMMENT"
+TT_NEWLINE     = 4
+TT_INDENT      = 5
+TT_DEDENT      = 6
+TT_TYPE_COMMENT = 7
 
-TT_FSTRING_START  = "FSTRING_START"
-TT_FSTRING_MIDDLE = "FSTRING_MIDDLE"
-TT_FSTRING_END    = "FSTRING_END"
+TT_FSTRING_START  = 8
+TT_FSTRING_MIDDLE = 9
+TT_FSTRING_END    = 10
 
-TT_TSTRING_START  = "TSTRING_START"
-TT_TSTRING_MIDDLE = "TSTRING_MIDDLE"
-TT_TSTRING_END    = "TSTRING_END"
+TT_TSTRING_START  = 11
+TT_TSTRING_MIDDLE = 12
+TT_TSTRING_END    = 13
 
-TT_ELLIPSIS    = "ELLIPSIS"     # '...'
-TT_ENDMARKER   = "ENDMARKER"    # fin de archivo
+TT_ELLIPSIS    = 14  # '...'
+TT_ENDMARKER   = 15  # fin de archivo
 
 
 # Operadores y signos de puntuación (podemos mapearlos por lexema en el lexer)
-TT_PLUS        = "PLUS"         # +
-TT_MINUS       = "MINUS"        # -
-TT_STAR        = "STAR"         # *
-TT_SLASH       = "SLASH"        # /
-TT_DOUBLE_SLASH = "DOUBLE_SLASH"  # //
-TT_PERCENT     = "PERCENT"      # %
-TT_AT          = "AT"           # @
-TT_PIPE        = "PIPE"         # |
-TT_AMPERSAND   = "AMPERSAND"    # &
-TT_CARET       = "CARET"        # ^
-TT_TILDE       = "TILDE"        # ~
-TT_LSHIFT      = "LSHIFT"       # <<
-TT_RSHIFT      = "RSHIFT"       # >>
-TT_DOUBLE_STAR = "DOUBLE_STAR"  # **
-
-TT_EQUAL       = "EQUAL"        # =
-TT_EQEQUAL     = "EQEQUAL"      # ==
-TT_NOTEQUAL    = "NOTEQUAL"     # !=
-TT_LESSEQUAL   = "LESSEQUAL"    # <=
-TT_GREATEREQUAL = "GREATEREQUAL"  # >=
-TT_LESS        = "LESS"         # <
-TT_GREATER     = "GREATER"      # >
-
-TT_LPAREN      = "LPAREN"       # (
-TT_RPAREN      = "RPAREN"       # )
-TT_LBRACKET    = "LBRACKET"     # [
-TT_RBRACKET    = "RBRACKET"     # ]
-TT_LBRACE      = "LBRACE"       # {
-TT_RBRACE      = "RBRACE"       # }
-
-TT_COMMA       = "COMMA"        # ,
-TT_COLON       = "COLON"        # :
-TT_SEMI        = "SEMI"         # ;
-TT_DOT         = "DOT"          # .
-TT_ARROW       = "ARROW"        # ->
-TT_PLUSEQUAL   = "PLUSEQUAL"    # +=
-TT_MINEQUAL    = "MINEQUAL"     # -=
-TT_STAREQUAL   = "STAREQUAL"    # *=
-TT_SLASHEQUAL  = "SLASHEQUAL"   # /=
-TT_PERCENTEQUAL = "PERCENTEQUAL" # %=
-TT_ATEQUAL     = "ATEQUAL"      # @=
-TT_AMPEREQUAL  = "AMPEREQUAL"   # &=
-TT_PIPEEQUAL   = "PIPEEQUAL"    # |=
-TT_CARETEQUAL  = "CARETEQUAL"   # ^=
-TT_LSHIFTEQUAL = "LSHIFTEQUAL"  # <<=
-TT_RSHIFTEQUAL = "RSHIFTEQUAL"  # >>=
-TT_DOUBLE_STAREQUAL = "DOUBLE_STAREQUAL"  # **=
-TT_DOUBLE_SLASHEQUAL = "DOUBLE_SLASHEQUAL"  # //=
+TT_PLUS        = 16  # +
+TT_MINUS       = 17  # -
+TT_STAR        = 18  # *
+TT_SLASH       = 19  # /
+TT_DOUBLE_SLASH = 20  # //
+TT_PERCENT     = 21  # %
+TT_AT          = 22  # @
+TT_PIPE        = 23  # |
+TT_AMPERSAND   = 24  # &
+TT_CARET       = 25  # ^
+TT_TILDE       = 26  # ~
+TT_LSHIFT      = 27  # <<
+TT_RSHIFT      = 28  # >>
+TT_DOUBLE_STAR = 29  # **
+
+TT_EQUAL       = 30  # =
+TT_EQEQUAL     = 31  # ==
+TT_NOTEQUAL    = 32  # !=
+TT_LESSEQUAL   = 33  # <=
+TT_GREATEREQUAL = 34  # >=
+TT_LESS        = 35  # <
+TT_GREATER     = 36  # >
+
+TT_LPAREN      = 37  # (
+TT_RPAREN      = 38  # )
+TT_LBRACKET    = 39  # [
+TT_RBRACKET    = 40  # ]
+TT_LBRACE      = 41  # {
+TT_RBRACE      = 42  # }
+
+TT_COMMA       = 43  # ,
+TT_COLON       = 44  # :
+TT_SEMI        = 45  # ;
+TT_DOT         = 46  # .
+TT_ARROW       = 47  # ->
+TT_PLUSEQUAL   = 48  # +=
+TT_MINEQUAL    = 49  # -=
+TT_STAREQUAL   = 50  # *=
+TT_SLASHEQUAL  = 51  # /=
+TT_PERCENTEQUAL = 52  # %=
+TT_ATEQUAL     = 53  # @=
+TT_AMPEREQUAL  = 54  # &=
+TT_PIPEEQUAL   = 55  # |=
+TT_CARETEQUAL  = 56  # ^=
+TT_LSHIFTEQUAL = 57  # <<=
+TT_RSHIFTEQUAL = 58  # >>=
+TT_DOUBLE_STAREQUAL = 59  # **=
+TT_DOUBLE_SLASHEQUAL = 60  # //=
+
+
+# Keywords con tipo propio (las que usa la gramática del parser)
+TT_KW_IF       = 61
+TT_KW_ELIF     = 62
+TT_KW_ELSE     = 63
+TT_KW_WHILE    = 64
+TT_KW_FOR      = 65
+TT_KW_IN       = 66
+TT_KW_DEF      = 67
+TT_KW_RETURN   = 68
+TT_KW_PASS     = 69
+TT_KW_BREAK    = 70
+TT_KW_CONTINUE = 71
+TT_KW_AND      = 72
+TT_KW_OR       = 73
+TT_KW_NOT      = 74
+TT_KW_TRUE     = 75
+TT_KW_FALSE    = 76
+TT_KW_NONE     = 77
+
+
+# Los mismos tipos como IntEnum (TT.NAME == TT_NAME), armado a partir de las
+# constantes TT_*: útil para depurar o recorrer los tipos. El lexer y el
+# parser siguen usando las constantes int, que se comparan más rápido que
+# los miembros del enum.
+TT = IntEnum("TT", [
+    (name[3:], value)
+    for name, value in sorted(
+        ((k, v) for k, v in globals().items() if k.startswith("TT_")),
+        key=lambda kv: kv[1],
+    )
+])
+
+# Nombre legible de cada tipo, indexado por su valor: TT_NAMES[TT_NAME] == "NAME"
+TT_NAMES: Tuple[str, ...] = ("",) + tuple(member.name for member in TT)
+
+
+def token_name(token_type: int) -> str:
+    """Devuelve el nombre legible de un tipo de token (por ejemplo "NAME")."""
+    return TT_NAMES[token_type]
 
 
 # ===================================
@@ -100,12 +148,12 @@ TT_DOUBLE_SLASHEQUAL = "DOUBLE_SLASHEQUAL"  # //=
 # ===================================
 # La gramática distingue entre "keywords" y "soft keywords".
 # Para simplificar:
-# - El lexer devolverá type = NAME para todos.
-# - El value será el texto ("if", "while", "match", "case"...).
-# - El parser, cuando necesite un keyword, verificará value.
-# Esto encaja bien con la gramática PEG que usa 'if', 'while', etc.
+# - El lexer devolverá el tipo de KEYWORD_TYPES para las keywords que usa
+#   el parser y type = NAME para todas las demás.
+# - El value será siempre el texto ("if", "while", "match", "case"...).
+# - Así "match", "case" o "type" siguen funcionando como nombres.
 
-KEYWORDS: Set[str] = {
+KEYWORDS: FrozenSet[str] = frozenset(sys.intern(k) for k in (
     # Control de flujo
     "if", "elif", "else",
     "while", "for", "in",
@@ -137,6 +185,28 @@ KEYWORDS: Set[str] = {
 
     # Otros usados en la gramática (por ejemplo en patrones)
     # (si agregas más reglas, aquí las puedes sumar)
+))
+
+
+# Lexema -> tipo de token, para las keywords que tienen tipo propio
+KEYWORD_TYPES: Dict[str, int] = {
+    "if": TT_KW_IF,
+    "elif": TT_KW_ELIF,
+    "else": TT_KW_ELSE,
+    "while": TT_KW_WHILE,
+    "for": TT_KW_FOR,
+    "in": TT_KW_IN,
+    "def": TT_KW_DEF,
+    "return": TT_KW_RETURN,
+    "pass": TT_KW_PASS,
+    "break": TT_KW_BREAK,
+    "continue": TT_KW_CONTINUE,
+    "and": TT_KW_AND,
+    "or": TT_KW_OR,
+    "not": TT_KW_NOT,
+    "True": TT_KW_TRUE,
+    "False": TT_KW_FALSE,
+    "None": TT_KW_NONE,
 }
 
 
@@ -148,32 +218,69 @@ def is_keyword(ident: str) -> bool:
     return ident in KEYWORDS
 
 
+# ==========================================================
+#  POSICIONES EN EL FUENTE
+# ==========================================================
+
+def offset_to_position(line_starts: Sequence[int], offset: int) -> Tuple[int, int]:
+    """
+    Convierte un offset del texto fuente en (línea, columna), ambas 1-based.
+
+    line_starts es la lista ordenada de posiciones de cada '\n' del texto,
+    con -1 al principio como inicio virtual de la línea 1 (la que arma el
+    lexer). Se usa bisect_left para que el propio '\n' cuente en su línea.
+    """
+    idx = bisect_left(line_starts, offset) - 1
+    return idx + 1, offset - line_starts[idx]
+
+
 # ==========================================================
 #  CLASE TOKEN
 # ==========================================================
 
-@dataclass
-class Token:
+class Token(NamedTuple):
     """
     Representa un token producido por el lexer.
 
+    Es una tupla con nombre (inmutable, sin __dict__): construirla es más
+    barato que instanciar una clase normal y ocupa menos memoria, lo que
+    importa porque el lexer crea una por token.
+
     Atributos:
-        type  - tipo de token (por ejemplo: NAME, NUMBER, STRING, NEWLINE, etc.)
+        type  - tipo de token (TT_NAME, TT_NUMBER, TT_STRING, TT_NEWLINE, etc.)
         value - lexema o valor interpretado:
                   * NAME  -> string con el nombre o keyword
                   * NUMBER -> valor numérico (int o float)
                   * STRING -> contenido de la cadena (sin comillas)
                   * otros -> normalmente el propio lexema o None
-        line  - número de línea (1-based)
-        column - número de columna (1-based, contando desde el inicio de línea)
+        offset - posición del token en el texto fuente (0-based)
+        line_starts - tabla de saltos de línea del fuente (compartida por
+                      todos los tokens de un mismo archivo)
+
+    line y column (1-based) se calculan bajo demanda a partir de offset:
+    solo los necesitan los mensajes de error y la salida --tokens, así que
+    el lexer no paga ese cálculo por cada token.
     """
-    type: str
+    type: int
     value: Any
-    line: int
-    column: int
+    offset: int
+    line_starts: Sequence[int]
+
+    def position(self) -> Tuple[int, int]:
+        """Devuelve (línea, columna) del token."""
+        return offset_to_position(self.line_starts, self.offset)
+
+    @property
+    def line(self) -> int:
+        return self.position()[0]
+
+    @property
+    def column(self) -> int:
+        return self.position()[1]
 
     def __repr__(self) -> str:
+        line, column = self.position()
         return (
-            f"Token(type={self.type!r}, value={self.value!r}, "
-            f"line={self.line}, column={self.column})"
+            f"Token(type={TT_NAMES[self.type]!r}, value={self.value!r}, "
+            f"line={line}, column={column})"
         )